@@ -7,6 +7,7 @@ from app.core.config import settings
 from app.core.database import AsyncSessionLocal
 from app.models.oauth_account import OAuthAccount
 from app.api.deps import get_current_user
+from app.services.token_cache import cache_token
 import time
 
 router = APIRouter()
@@ -69,6 +70,8 @@ async def spotify_callback(
         db.add(account)
 
     await db.commit()
+    # Replace any cached token from the previous connection
+    await cache_token(int(user_id), "spotify", token["access_token"], expires_at)
     
 
     return RedirectResponse(settings.FRONTEND_URL)
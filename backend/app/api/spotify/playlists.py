@@ -1,11 +1,10 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-import spotipy
-from app.models.oauth_account import OAuthAccount
 from app.core.database import AsyncSessionLocal
 from app.api.deps import get_current_user
-from app.services.oauth_utils import ensure_token_valid
+from app.services.oauth_utils import get_access_token
+from app.services.playlist_cache import conditional_json, get_cached_playlists, store_playlists
+from app.services.spotify import get_user_playlists
 
 router = APIRouter()
 
@@ -15,21 +14,19 @@ async def get_db():
 
 @router.get("/playlists")
 async def get_playlists(
+    request: Request,
     user_id: str = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    stmt = select(OAuthAccount).where(
-        OAuthAccount.user_id == int(user_id),
-        OAuthAccount.provider == "spotify",
-    )
-    result = await db.execute(stmt)
-    account = result.scalar_one_or_none()
-    if not account:
-        return []
+    entry, fresh = await get_cached_playlists("spotify", int(user_id))
+    if entry and fresh:
+        return conditional_json(request, entry["playlists"])
 
-    account = await ensure_token_valid(db, account)
+    access_token = await get_access_token(db, int(user_id), "spotify")
+    if not access_token:
+        return []
 
-    sp = spotipy.Spotify(auth=account.access_token)
-    playlists = sp.current_user_playlists(limit=50)
+    playlists = await get_user_playlists(access_token)
+    await store_playlists("spotify", int(user_id), playlists)
 
-    return playlists["items"]
+    return conditional_json(request, playlists)
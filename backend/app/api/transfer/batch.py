@@ -0,0 +1,146 @@
+import time
+import uuid
+from typing import Literal
+
+from celery import chord
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, Field
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user
+from app.core.database import AsyncSessionLocal
+from app.models.transfer import TransferBatch, TransferJob
+from app.services.match_cache import SPOTIFY_TO_YOUTUBE
+from app.services.oauth_utils import get_access_tokens
+from app.services.transfer_jobs import COUNTERS, FINAL_STATES, TASK_STATUS, new_job
+from app.services.transfer_progress import get_progress_snapshots
+from app.tasks.transfer_tasks import TRANSFER_TASKS, finish_transfer_batch_task, summarize_batch
+
+router = APIRouter()
+
+MAX_BATCH_PLAYLISTS = 50
+
+class BatchPlaylist(BaseModel):
+    id: str
+    title: str | None = None
+
+class BatchTransferRequest(BaseModel):
+    direction: Literal["spotify_to_youtube", "youtube_to_spotify"]
+    playlists: list[BatchPlaylist] = Field(min_length=1, max_length=MAX_BATCH_PLAYLISTS)
+    # Add only the tracks missing from the playlists earlier transfers created
+    sync: bool = False
+
+@router.post("/batch")
+async def start_transfer_batch(
+    payload: BatchTransferRequest,
+    user_id: str = Depends(get_current_user),
+):
+    """Transfer several playlists as one job; returns the batch id and one task id per playlist."""
+    # Load and refresh both tokens once here; the playlist tasks then find them in the token cache
+    async with AsyncSessionLocal() as db:
+        tokens = await get_access_tokens(db, int(user_id), ["spotify", "youtube"])
+    if not all(tokens.values()):
+        raise HTTPException(status_code=400, detail="Missing connected accounts")
+
+    default_title = "Transferred from Spotify" if payload.direction == SPOTIFY_TO_YOUTUBE else "Transferred from YouTube"
+    playlists, seen = [], set()
+    for playlist in payload.playlists:
+        if playlist.id in seen:
+            continue
+        seen.add(playlist.id)
+        playlists.append({
+            "playlist_id": playlist.id,
+            "title": (playlist.title.strip() if playlist.title else None) or default_title,
+            "task_id": str(uuid.uuid4()),
+        })
+
+    batch_id = str(uuid.uuid4())
+    async with AsyncSessionLocal() as db:
+        db.add(TransferBatch(
+            id=batch_id,
+            user_id=int(user_id),
+            direction=payload.direction,
+            playlists=playlists,
+            created_at=int(time.time()),
+        ))
+        db.add_all(
+            new_job(p["task_id"], int(user_id), payload.direction, p["playlist_id"])
+            for p in playlists
+        )
+        await db.commit()
+
+    # The playlists run in parallel, sharing the workers' match cache and
+    # in-flight searches; the callback sums their results under the batch id
+    task = TRANSFER_TASKS[payload.direction]
+    chord([
+        task.s(int(user_id), p["playlist_id"], p["title"], payload.sync).set(task_id=p["task_id"])
+        for p in playlists
+    ])(finish_transfer_batch_task.s().set(task_id=batch_id))
+
+    return {
+        "batch_id": batch_id,
+        "status": "Processing",
+        "playlists": [{"playlist_id": p["playlist_id"], "task_id": p["task_id"]} for p in playlists],
+    }
+
+async def get_batch_jobs(db: AsyncSession, batch: TransferBatch) -> list[TransferJob | None]:
+    """The job rows of a batch's playlists, in request order."""
+    task_ids = [p["task_id"] for p in batch.playlists]
+    result = await db.execute(select(TransferJob).where(TransferJob.id.in_(task_ids)))
+    jobs = {job.id: job for job in result.scalars()}
+    return [jobs.get(task_id) for task_id in task_ids]
+
+def batch_task_status(jobs: list[TransferJob | None]) -> str:
+    if all(job and job.state in FINAL_STATES for job in jobs):
+        return "SUCCESS"
+    return "STARTED" if any(job and job.state != "queued" for job in jobs) else "PENDING"
+
+def batch_result(jobs: list[TransferJob | None]) -> dict | None:
+    """The summed result once every playlist has finished, as the chord callback returns it."""
+    if batch_task_status(jobs) != "SUCCESS":
+        return None
+    return summarize_batch([job.result or {"error": job.error} for job in jobs])
+
+@router.get("/batch/{batch_id}")
+async def get_transfer_batch_status(
+    batch_id: str,
+    user_id: str = Depends(get_current_user),
+):
+    """Status and latest progress of every playlist in a batch, plus their sums."""
+    async with AsyncSessionLocal() as db:
+        batch = await db.get(TransferBatch, batch_id)
+        if not batch or batch.user_id != int(user_id):
+            raise HTTPException(status_code=404, detail="Transfer batch not found")
+        jobs = await get_batch_jobs(db, batch)
+
+    # Live counts come from the latest progress events; the job rows lag
+    # behind them by up to TRANSFER_STATUS_INTERVAL
+    snapshots = await get_progress_snapshots([p["task_id"] for p in batch.playlists])
+    totals = {"total": 0, "matched": 0, "skipped": 0}
+    playlists = []
+    for playlist, job, snapshot in zip(batch.playlists, jobs, snapshots):
+        state = job.state if job else "queued"
+        if state in FINAL_STATES or not snapshot:
+            counts = {name: getattr(job, name) for name in COUNTERS} if job else {}
+        else:
+            counts = snapshot
+        for name in totals:
+            totals[name] += counts.get(name, 0)
+        playlists.append({
+            "playlist_id": playlist["playlist_id"],
+            "task_id": playlist["task_id"],
+            "task_status": TASK_STATUS[state],
+            "progress": snapshot,
+            "result": job.result if job else None,
+            "error": job.error if job else None,
+        })
+
+    return {
+        "batch_id": batch_id,
+        "direction": batch.direction,
+        "task_status": batch_task_status(jobs),
+        "completed": sum(1 for job in jobs if job and job.state in FINAL_STATES),
+        **totals,
+        "playlists": playlists,
+    }
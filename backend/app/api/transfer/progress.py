@@ -0,0 +1,86 @@
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import get_current_user
+from app.api.transfer.batch import batch_result, get_batch_jobs
+from app.core.database import AsyncSessionLocal
+from app.core.redis import get_redis
+from app.models.transfer import TransferBatch, TransferJob
+from app.services.transfer_jobs import FINAL_STATES, job_status
+from app.services.transfer_progress import FINAL_STAGES, progress_channel, snapshot_key
+
+router = APIRouter()
+
+HEARTBEAT_SECONDS = 15
+
+@router.get("/progress/{task_id}")
+async def stream_transfer_progress(
+    task_id: str,
+    request: Request,
+    user_id: str = Depends(get_current_user),
+):
+    """Server-Sent Events stream of a transfer's progress until it is done or failed."""
+    client = get_redis()
+    if not client:
+        raise HTTPException(status_code=503, detail="Live progress is not available")
+
+    async with AsyncSessionLocal() as db:
+        # A batch id streams the batch's final summary
+        job = await db.get(TransferJob, task_id)
+        batch = await db.get(TransferBatch, task_id) if not job else None
+    # The API adds the row before it sends the task, so a missing row is an unknown id
+    owner = job or batch
+    if not owner or owner.user_id != int(user_id):
+        raise HTTPException(status_code=404, detail="Transfer not found")
+
+    async def finished() -> str | None:
+        """The final event, read from the job rows once the transfer has finished.
+
+        Published events cannot be relied on alone: the snapshot expires, a
+        publish may have failed, and the chord callback never runs when a
+        playlist task fails.
+        """
+        async with AsyncSessionLocal() as db:
+            if batch:
+                result = batch_result(await get_batch_jobs(db, batch))
+                return json.dumps({"stage": "done", "result": result}) if result else None
+            row = await db.get(TransferJob, task_id)
+        if row.state not in FINAL_STATES:
+            return None
+        return json.dumps({**job_status(row), "stage": row.state, "result": row.result})
+
+    async def events():
+        pubsub = client.pubsub()
+        # Subscribe before reading the snapshot so no update falls in between
+        await pubsub.subscribe(progress_channel(task_id))
+        try:
+            latest = await client.get(snapshot_key(task_id))
+            if latest:
+                yield f"data: {latest}\n\n"
+                if json.loads(latest).get("stage") in FINAL_STAGES:
+                    return
+            if final := await finished():
+                yield f"data: {final}\n\n"
+                return
+            while not await request.is_disconnected():
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=HEARTBEAT_SECONDS)
+                if message is None:
+                    if final := await finished():
+                        yield f"data: {final}\n\n"
+                        return
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"data: {message['data']}\n\n"
+                if json.loads(message["data"]).get("stage") in FINAL_STAGES:
+                    return
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
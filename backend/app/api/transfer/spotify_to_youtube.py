@@ -1,13 +1,20 @@
+import uuid
+
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 
 from app.api.deps import get_current_user
+from app.core.database import AsyncSessionLocal
+from app.services.match_cache import SPOTIFY_TO_YOUTUBE
+from app.services.transfer_jobs import new_job
 from app.tasks.transfer_tasks import transfer_spotify_to_youtube_task
 
 router = APIRouter()
 
 class TransferRequest(BaseModel):
     title: str | None = None
+    # Add only the tracks missing from the playlist an earlier transfer created
+    sync: bool = False
 
 @router.post("/spotify-to-youtube/{playlist_id}")
 async def transfer_spotify_to_youtube(
@@ -16,5 +23,12 @@ async def transfer_spotify_to_youtube(
     user_id: str = Depends(get_current_user),
 ):
     target_title = (payload.title.strip() if payload and payload.title else None) or "Transferred from Spotify"
-    task = transfer_spotify_to_youtube_task.delay(int(user_id), playlist_id, target_title)
-    return {"task_id": task.id, "status": "Processing"}
+    task_id = str(uuid.uuid4())
+    async with AsyncSessionLocal() as db:
+        db.add(new_job(task_id, int(user_id), SPOTIFY_TO_YOUTUBE, playlist_id))
+        await db.commit()
+    transfer_spotify_to_youtube_task.apply_async(
+        (int(user_id), playlist_id, target_title, bool(payload and payload.sync)),
+        task_id=task_id,
+    )
+    return {"task_id": task_id, "status": "Processing"}
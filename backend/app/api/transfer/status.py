@@ -1,6 +1,14 @@
-from fastapi import APIRouter, Depends
-from celery.result import AsyncResult
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.orm import defer
+
 from app.api.deps import get_current_user
+from app.api.transfer.batch import batch_result, batch_task_status, get_batch_jobs
+from app.core.database import AsyncSessionLocal
+from app.models.transfer import TransferBatch, TransferJob
+from app.services.transfer_jobs import job_status
 
 router = APIRouter()
 
@@ -9,10 +17,39 @@ async def get_transfer_status(
     task_id: str,
     user_id: str = Depends(get_current_user),
 ):
-    task_result = AsyncResult(task_id)
-    result = {
+    """State, counters and, once finished, the result of a transfer, read from its job row."""
+    async with AsyncSessionLocal() as db:
+        job = await db.get(TransferJob, task_id)
+        if job and job.user_id == int(user_id):
+            return job_status(job)
+
+        # A batch id gives the summed result once every playlist has finished
+        batch = await db.get(TransferBatch, task_id) if not job else None
+        if not batch or batch.user_id != int(user_id):
+            raise HTTPException(status_code=404, detail="Transfer not found")
+        jobs = await get_batch_jobs(db, batch)
+    return {
         "task_id": task_id,
-        "task_status": task_result.status,
-        "task_result": task_result.result if task_result.ready() else None
+        "task_status": batch_task_status(jobs),
+        "task_result": batch_result(jobs),
     }
-    return result
+
+@router.get("/jobs")
+async def list_transfer_jobs(
+    state: Literal["queued", "running", "deferred", "retrying", "done", "failed"] | None = None,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    user_id: str = Depends(get_current_user),
+):
+    """The current user's transfers, newest first, without their full results."""
+    query = (
+        select(TransferJob)
+        .where(TransferJob.user_id == int(user_id))
+        .options(defer(TransferJob.result))
+    )
+    if state:
+        query = query.where(TransferJob.state == state)
+    query = query.order_by(TransferJob.created_at.desc(), TransferJob.id).limit(limit).offset(offset)
+    async with AsyncSessionLocal() as db:
+        jobs = (await db.execute(query)).scalars().all()
+    return {"jobs": [job_status(job, include_result=False) for job in jobs]}
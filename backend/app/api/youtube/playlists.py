@@ -1,75 +1,92 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-import httpx
 
 from app.core.database import AsyncSessionLocal
-from app.models.oauth_account import OAuthAccount
 from app.api.deps import get_current_user
-from app.services.oauth_utils import ensure_token_valid
+from app.services.oauth_utils import get_access_token
+from app.services.playlist_cache import conditional_json, get_cached_playlists, store_playlists
+from app.services.youtube import YouTubeAPIError, check_youtube_response, youtube_request
 
 router = APIRouter()
 
-YOUTUBE_BASE = "https://www.googleapis.com/youtube/v3"
+# Partial response: the listing shows only each playlist's ID, title and size
+PLAYLIST_FIELDS = "etag,nextPageToken,items(id,snippet/title,contentDetails/itemCount)"
 
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
 
 
+async def _fetch_playlist_pages(access_token: str, cached_pages: list[dict]) -> list[dict]:
+    """Fetch every page of the user's playlists, revalidating cached pages by ETag."""
+    # Pages are keyed by the pageToken that requested them ("" for the first)
+    cached = {page["token"]: page for page in cached_pages}
+    pages = []
+    page_token = ""
+
+    while True:
+        previous = cached.get(page_token)
+        r = await youtube_request(
+            access_token,
+            "GET",
+            "playlists",
+            params={
+                "part": "snippet,contentDetails",
+                "mine": "true",
+                "maxResults": 50,
+                "pageToken": page_token or None,
+                "fields": PLAYLIST_FIELDS,
+            },
+            headers={"If-None-Match": previous["etag"]} if previous and previous["etag"] else {},
+        )
+
+        if r.status_code == 304:
+            page = previous
+        else:
+            try:
+                data = check_youtube_response(r)
+            except YouTubeAPIError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+            page = {
+                "token": page_token,
+                "etag": r.headers.get("etag") or data.get("etag"),
+                "next": data.get("nextPageToken"),
+                "items": [
+                    {
+                        "id": item["id"],
+                        "name": item["snippet"]["title"],
+                        "count": item["contentDetails"]["itemCount"],
+                    }
+                    for item in data["items"]
+                ],
+            }
+
+        pages.append(page)
+        page_token = page["next"]
+        if not page_token:
+            break
+
+    return pages
+
+
 @router.get("/playlists")
 async def get_youtube_playlists(
+    request: Request,
     user_id: str = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(
-        select(OAuthAccount).where(
-            OAuthAccount.user_id == int(user_id),
-            OAuthAccount.provider == "youtube",
-        )
-    )
-    yt_acc = result.scalar_one_or_none()
+    entry, fresh = await get_cached_playlists("youtube", int(user_id))
+    if entry and fresh:
+        return conditional_json(request, entry["playlists"])
 
-    if not yt_acc:
+    access_token = await get_access_token(db, int(user_id), "youtube")
+
+    if not access_token:
         return []
 
-    yt_acc = await ensure_token_valid(db, yt_acc)
-
-    playlists = []
-    page_token = None
-
-    async with httpx.AsyncClient() as client:
-        while True:
-            r = await client.get(
-                f"{YOUTUBE_BASE}/playlists",
-                params={
-                    "part": "snippet,contentDetails",
-                    "mine": "true",
-                    "maxResults": 50,
-                    "pageToken": page_token,
-                },
-                headers={
-                    "Authorization": f"Bearer {yt_acc.access_token}"
-                },
-            )
-            data = r.json()
-
-            if "error" in data:
-                print("YOUTUBE RESPONSE:", data)
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"YouTube API error: {data['error']['message']}",
-                )
-
-            for item in data["items"]:
-                playlists.append({
-                    "id": item["id"],
-                    "name": item["snippet"]["title"],
-                    "count": item["contentDetails"]["itemCount"],
-                })
-
-            page_token = data.get("nextPageToken")
-            if not page_token:
-                break
-
-    return playlists
+    pages = await _fetch_playlist_pages(access_token, entry["pages"] if entry else [])
+    playlists = [playlist for page in pages for playlist in page["items"]]
+    await store_playlists("youtube", int(user_id), playlists, pages=pages)
+
+    return conditional_json(request, playlists)
@@ -1,5 +1,10 @@
 from celery import Celery
+from celery.signals import worker_init, worker_process_init, worker_process_shutdown, worker_shutdown
 from app.core.config import settings
+from app.core.database import engine
+from app.core.http_client import close_http_clients
+from app.core.metrics import start_metrics_server
+from app.core.worker_loop import start_worker_loop, stop_worker_loop
 
 celery_app = Celery(
     "playlistbridge_worker",
@@ -16,3 +21,29 @@ celery_app.conf.update(
     # Auto-discover tasks from the tasks module
     imports=("app.tasks.transfer_tasks",),
 )
+
+
+@worker_init.connect
+def start_worker_metrics(**kwargs):
+    if settings.WORKER_METRICS_PORT:
+        start_metrics_server(settings.WORKER_METRICS_PORT)
+
+
+@worker_process_init.connect
+def start_worker_process_loop(**kwargs):
+    # Connections inherited from the parent must not be shared with it
+    engine.sync_engine.dispose(close=False)
+    start_worker_loop()
+
+
+async def _close_worker_resources():
+    await close_http_clients()
+    await engine.dispose()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def stop_worker_process_loop(**kwargs):
+    # worker_process_shutdown fires in prefork children, worker_shutdown for
+    # the threads/solo pools; whichever comes first does the work
+    stop_worker_loop(_close_worker_resources)
@@ -1,5 +1,7 @@
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from app.core.config import settings
+from app.core.metrics import instrument_engine
 
 database_url = settings.DATABASE_URL
 if database_url.startswith("postgres://"):
@@ -10,9 +12,22 @@ elif database_url.startswith("postgresql://"):
 engine = create_async_engine(
     database_url,
     echo=False,
+    # Sized for many concurrent transfers sharing one worker process
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_pre_ping=True,
 )
 
+instrument_engine(engine.sync_engine)
+
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
     expire_on_commit=False,
 )
+
+
+def upsert(model):
+    """Return an INSERT for ``model`` that supports ``on_conflict_do_update``."""
+    if engine.dialect.name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
@@ -0,0 +1,139 @@
+import asyncio
+import logging
+import os
+import time
+
+import httpx
+
+from app.core.config import settings
+from app.core.metrics import PROVIDER_REQUEST_SECONDS, PROVIDER_REQUESTS
+from app.core.rate_limit import backoff_delay, get_limiter, retry_after
+
+logger = logging.getLogger(__name__)
+
+# name -> (pid, loop, client). Clients are bound to the event loop that created
+# them, so a new one is built if the process forks or the loop changes.
+_clients: dict[str, tuple[int, asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+
+# Worth retrying; 429 and 503 also mean the provider wants fewer requests
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+THROTTLE_STATUSES = {429, 503}
+# Safe to send again after a 5xx or a dropped connection; a POST may already have been applied
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+def _build_client(base_url: str) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        base_url=base_url,
+        http2=settings.HTTP2_ENABLED,
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(settings.HTTP_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT),
+    )
+
+
+def get_http_client(name: str, base_url: str) -> httpx.AsyncClient:
+    """Return the long-lived pooled client for ``name`` in this process/event loop."""
+    pid = os.getpid()
+    loop = asyncio.get_running_loop()
+    entry = _clients.get(name)
+    if entry and entry[0] == pid and entry[1] is loop and not entry[2].is_closed:
+        return entry[2]
+    client = _build_client(base_url)
+    _clients[name] = (pid, loop, client)
+    return client
+
+
+async def close_http_clients():
+    loop = asyncio.get_running_loop()
+    for name, (pid, client_loop, client) in list(_clients.items()):
+        if pid == os.getpid() and client_loop is loop:
+            await client.aclose()
+        _clients.pop(name, None)
+
+
+def record_call(provider: str, endpoint: str, elapsed: float):
+    PROVIDER_REQUEST_SECONDS.labels(provider, endpoint).observe(elapsed)
+    logger.debug("%s %s took %.1f ms", provider, endpoint, elapsed * 1000)
+
+
+async def timed_request(
+    client: httpx.AsyncClient,
+    provider: str,
+    endpoint: str,
+    method: str,
+    url: str,
+    **kwargs,
+) -> httpx.Response:
+    """Send a request on ``client`` and record its latency under (provider, endpoint)."""
+    start = time.perf_counter()
+    status = "error"
+    try:
+        resp = await client.request(method, url, **kwargs)
+        status = str(resp.status_code)
+        return resp
+    finally:
+        record_call(provider, endpoint, time.perf_counter() - start)
+        PROVIDER_REQUESTS.labels(provider, endpoint, status).inc()
+
+
+async def send_request(
+    client: httpx.AsyncClient,
+    provider: str,
+    endpoint: str,
+    method: str,
+    url: str,
+    is_throttled=None,
+    before_attempt=None,
+    **kwargs,
+) -> httpx.Response:
+    """Send a request within ``provider``'s adaptive concurrency limit, retrying transient failures.
+
+    Throttling (429, 503, or whatever ``is_throttled(resp)`` recognizes) halves
+    the provider's limit and is retried after ``Retry-After`` or a jittered
+    backoff. Other 5xx responses and network errors are retried only for
+    idempotent methods or when the request never left. Once retries run out, or
+    the provider asks for a longer wait than ``HTTP_RETRY_MAX_DELAY``, the last
+    response is returned (or the last error raised) for the caller to handle.
+    ``before_attempt``, if given, is awaited before every attempt, retries
+    included; an error it raises ends the call.
+    """
+    limiter = get_limiter(provider)
+    idempotent = method.upper() in IDEMPOTENT_METHODS
+    attempt = 0
+    while True:
+        if before_attempt:
+            await before_attempt()
+        started = await limiter.acquire()
+        try:
+            resp = await timed_request(client, provider, endpoint, method, url, **kwargs)
+        except httpx.TransportError as e:
+            # A timeout is a sign of overload as well
+            await limiter.release(started, throttled=isinstance(e, httpx.TimeoutException))
+            never_sent = isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+            if attempt >= settings.HTTP_MAX_RETRIES or not (idempotent or never_sent):
+                raise
+            delay = backoff_delay(attempt)
+            logger.info("%s %s failed (%s), retrying in %.1f s", provider, endpoint, e, delay)
+        else:
+            throttled = resp.status_code in THROTTLE_STATUSES or bool(is_throttled and is_throttled(resp))
+            await limiter.release(started, throttled)
+            retryable = throttled or (idempotent and resp.status_code in RETRY_STATUSES)
+            if not retryable or attempt >= settings.HTTP_MAX_RETRIES:
+                return resp
+            requested = retry_after(resp)
+            if requested is not None:
+                if requested > settings.HTTP_RETRY_MAX_DELAY:
+                    return resp
+                # The provider's wait applies to every request, not just this one
+                limiter.pause(requested)
+            delay = requested if requested is not None else backoff_delay(attempt)
+            logger.info(
+                "%s %s returned %s, retrying in %.1f s (limit %.1f in flight)",
+                provider, endpoint, resp.status_code, delay, limiter.limit,
+            )
+        attempt += 1
+        await asyncio.sleep(delay)
@@ -2,6 +2,8 @@ import asyncio
 from app.core.database import engine
 from app.models.user import Base
 from app.models.oauth_account import OAuthAccount
+from app.models.track_match import TrackMatch
+from app.models.transfer import PlaylistSync, SyncedTrack, TransferBatch, TransferJob, TransferItem
 
 async def init():
     async with engine.begin() as conn:
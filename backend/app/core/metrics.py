@@ -0,0 +1,172 @@
+"""Prometheus metrics for the API process and the Celery workers.
+
+The API serves them at ``/metrics``; a worker serves its own on
+``WORKER_METRICS_PORT``. Each process keeps its own registry, so run workers
+with the threads pool (one process each) for complete numbers.
+"""
+import functools
+import time
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest, start_http_server
+from sqlalchemy import event
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Provider calls: a few ms (cached at the edge) up to the HTTP timeout
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 15, 30)
+
+PROVIDER_REQUEST_SECONDS = Histogram(
+    "playlistbridge_provider_request_seconds",
+    "Latency of Spotify / YouTube API calls, per attempt",
+    ["provider", "endpoint"],
+    buckets=LATENCY_BUCKETS,
+)
+PROVIDER_REQUESTS = Counter(
+    "playlistbridge_provider_requests_total",
+    "Spotify / YouTube API calls by response status ('error' for network failures)",
+    ["provider", "endpoint", "status"],
+)
+PROVIDER_THROTTLED = Counter(
+    "playlistbridge_provider_throttled_total",
+    "Provider calls answered with throttling",
+    ["provider"],
+)
+PROVIDER_CONCURRENCY_LIMIT = Gauge(
+    "playlistbridge_provider_concurrency_limit",
+    "Current adaptive limit on provider calls in flight",
+    ["provider"],
+)
+YOUTUBE_QUOTA_UNITS = Counter(
+    "playlistbridge_youtube_quota_units_total",
+    "YouTube Data API quota units reserved",
+    ["operation"],
+)
+MATCH_CACHE_LOOKUPS = Counter(
+    "playlistbridge_match_cache_lookups_total",
+    "Match cache lookups by result (hits, negative_hits, misses, coalesced)",
+    ["result"],
+)
+STEP_SECONDS = Histogram(
+    "playlistbridge_transfer_step_seconds",
+    "Time spent in one transfer step, e.g. a track search including the cache",
+    ["step"],
+    buckets=LATENCY_BUCKETS,
+)
+TRANSFERS = Counter(
+    "playlistbridge_transfers_total",
+    "Finished transfer attempts by outcome (done, failed, deferred, retrying)",
+    ["outcome"],
+)
+TRANSFER_TRACKS = Counter(
+    "playlistbridge_transfer_tracks_total",
+    "Tracks handled by finished transfers",
+    ["direction", "outcome"],
+)
+TRANSFER_TRACKS_PER_SECOND = Histogram(
+    "playlistbridge_transfer_tracks_per_second",
+    "Throughput of each finished transfer",
+    ["direction"],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+TOKEN_REFRESHES = Counter(
+    "playlistbridge_token_refreshes_total",
+    "OAuth access token refreshes; 'shared' means another caller's refresh was reused",
+    ["provider", "outcome"],
+)
+DB_QUERY_SECONDS = Histogram(
+    "playlistbridge_db_query_seconds",
+    "Database statement latency",
+    ["statement"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "playlistbridge_http_request_seconds",
+    "API request latency by route",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+def timed_step(step: str):
+    """Decorate an async function to record its duration under ``step``."""
+    def decorate(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                STEP_SECONDS.labels(step).observe(time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+def record_transfer(direction: str, result: dict):
+    # Tracks an earlier transfer already settled were not handled again
+    synced = result.get("sync") or {}
+    TRANSFER_TRACKS.labels(direction, "matched").inc(result["matched"] - synced.get("already_matched", 0))
+    TRANSFER_TRACKS.labels(direction, "skipped").inc(result["skipped"] - synced.get("already_skipped", 0))
+    if result.get("tracks_per_second"):
+        TRANSFER_TRACKS_PER_SECOND.labels(direction).observe(result["tracks_per_second"])
+
+
+def instrument_engine(engine):
+    """Time every statement run through ``engine`` (an async engine's sync_engine)."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        DB_QUERY_SECONDS.labels(statement.lstrip().split(None, 1)[0].upper()).observe(elapsed)
+
+
+def _route_template(scope: Scope) -> str:
+    """``/api/transfer/status/{task_id}`` rather than the raw path, to keep the label set small."""
+    if "route" not in scope:
+        return "unmatched"
+    # Rebuilt from the path: the matched route's own path lacks the prefix of
+    # the router it was included with
+    path = scope["path"]
+    for name, value in scope.get("path_params", {}).items():
+        path = path.replace(f"/{value}", f"/{{{name}}}", 1)
+    return path
+
+
+class MetricsMiddleware:
+    """Record the latency of each API request under its route template."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUEST_SECONDS.labels(scope["method"], _route_template(scope), str(status)).observe(
+                time.perf_counter() - start
+            )
+
+
+async def metrics_response(request: Request) -> Response:
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
+def start_metrics_server(port: int):
+    """Serve this process's metrics on ``port`` from a background thread."""
+    start_http_server(port)
@@ -0,0 +1,95 @@
+"""Adaptive per-provider concurrency for outbound API calls.
+
+Each provider gets one limiter per process, shared by every transfer running
+there. The limit on requests in flight follows AIMD: it grows by about one
+per round of successful requests and halves when the provider throttles, so
+transfers settle near the fastest rate the provider tolerates.
+"""
+import asyncio
+import email.utils
+import os
+import random
+import time
+
+import httpx
+
+from app.core.config import settings
+from app.core.metrics import PROVIDER_CONCURRENCY_LIMIT, PROVIDER_THROTTLED
+
+# name -> (pid, loop, limiter), rebuilt like the HTTP clients when the process or loop changes
+_limiters: dict[str, tuple[int, asyncio.AbstractEventLoop, "AdaptiveLimiter"]] = {}
+
+
+class AdaptiveLimiter:
+    """Limits requests in flight to ``limit``, adjusted by additive increase, multiplicative decrease."""
+
+    def __init__(self, name: str, initial: int, maximum: int, minimum: int = 1):
+        self.name = name
+        self.minimum = minimum
+        self.maximum = max(maximum, minimum)
+        self.limit = float(min(max(initial, minimum), self.maximum))
+        self.in_flight = 0
+        self.throttled = 0
+        self._resume_at = 0.0
+        self._last_decrease = 0.0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self) -> float:
+        """Wait for a free slot (and any Retry-After pause); returns the start time for ``release``."""
+        while (delay := self._resume_at - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        return time.monotonic()
+
+    async def release(self, started: float, throttled: bool = False):
+        async with self._cond:
+            self.in_flight -= 1
+            if throttled:
+                self.throttled += 1
+                PROVIDER_THROTTLED.labels(self.name).inc()
+                # Requests sent before the last decrease saw the old limit;
+                # their throttling must not halve it again
+                if started >= self._last_decrease:
+                    self.limit = max(self.minimum, self.limit / 2)
+                    self._last_decrease = time.monotonic()
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            PROVIDER_CONCURRENCY_LIMIT.labels(self.name).set(self.limit)
+            self._cond.notify_all()
+
+    def pause(self, seconds: float):
+        """Hold back every new request for ``seconds``, e.g. as told by Retry-After."""
+        self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+
+def get_limiter(provider: str) -> AdaptiveLimiter:
+    pid = os.getpid()
+    loop = asyncio.get_running_loop()
+    entry = _limiters.get(provider)
+    if entry and entry[0] == pid and entry[1] is loop:
+        return entry[2]
+    limiter = AdaptiveLimiter(provider, settings.HTTP_INITIAL_CONCURRENCY, settings.HTTP_MAX_CONCURRENCY)
+    _limiters[provider] = (pid, loop, limiter)
+    return limiter
+
+
+def retry_after(resp: httpx.Response) -> float | None:
+    """Seconds the provider asked us to wait, from a delta-seconds or HTTP-date Retry-After."""
+    value = resp.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff for the ``attempt``-th retry (0-based)."""
+    return random.uniform(0, min(settings.HTTP_RETRY_MAX_DELAY, settings.HTTP_RETRY_BACKOFF * 2 ** attempt))
@@ -0,0 +1,82 @@
+import asyncio
+import logging
+import os
+import time
+import uuid
+from contextlib import asynccontextmanager
+
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Delete the lock only if we still own it
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+_clients: dict[int, tuple[asyncio.AbstractEventLoop, redis.Redis]] = {}
+
+
+def get_redis_url() -> str | None:
+    if settings.REDIS_URL:
+        return settings.REDIS_URL
+    if settings.CELERY_RESULT_BACKEND.startswith(("redis://", "rediss://")):
+        return settings.CELERY_RESULT_BACKEND
+    return None
+
+
+def get_redis() -> redis.Redis | None:
+    """Return this process's Redis client, or None when no Redis is configured."""
+    url = get_redis_url()
+    if not url:
+        return None
+    pid = os.getpid()
+    loop = asyncio.get_running_loop()
+    entry = _clients.get(pid)
+    if entry and entry[0] is loop:
+        return entry[1]
+    client = redis.from_url(url, decode_responses=True)
+    _clients[pid] = (loop, client)
+    return client
+
+
+@asynccontextmanager
+async def redis_lock(key: str, ttl_ms: int, done=None):
+    """Hold ``key`` across workers for at most ``ttl_ms`` while the block runs.
+
+    While another worker holds it, waits, polling the async ``done()`` if given
+    and giving up as soon as it returns true (the other worker has published
+    its result). The block runs unlocked without Redis, when Redis fails, or
+    once ``ttl_ms`` has passed. It receives True if another worker held the
+    lock first, i.e. when it is worth re-checking a shared cache.
+    """
+    client = get_redis()
+    if not client:
+        yield False
+        return
+
+    token = uuid.uuid4().hex
+    acquired = contended = False
+    deadline = time.monotonic() + ttl_ms / 1000
+    try:
+        while not (acquired := await client.set(key, token, nx=True, px=ttl_ms)):
+            contended = True
+            if (done and await done()) or time.monotonic() > deadline:
+                break
+            await asyncio.sleep(0.1)
+    except RedisError as e:
+        logger.warning("redis lock %s failed: %s", key, e)
+    try:
+        yield contended
+    finally:
+        if acquired:
+            try:
+                await client.eval(RELEASE_SCRIPT, 1, key, token)
+            except RedisError:
+                pass
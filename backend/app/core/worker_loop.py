@@ -0,0 +1,59 @@
+"""One long-lived asyncio event loop per worker process.
+
+Celery tasks are synchronous, so each task used to drive its own
+``run_until_complete`` and a process ran one transfer at a time. Instead the
+loop runs forever in a background thread and tasks submit their coroutines to
+it. Run the worker with the threads pool (``--pool threads --concurrency N``)
+and up to N transfers share one process, one DB engine and one set of HTTP
+pools, each waiting on the network without blocking the others.
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import Future
+
+_loop: asyncio.AbstractEventLoop | None = None
+_thread: threading.Thread | None = None
+_pid: int | None = None
+_lock = threading.Lock()
+
+
+def start_worker_loop() -> asyncio.AbstractEventLoop:
+    """Start this process's loop thread if it is not already running."""
+    global _loop, _thread, _pid
+    with _lock:
+        # A forked child inherits the parent's globals but not its threads
+        if _loop is not None and _pid == os.getpid() and not _loop.is_closed():
+            return _loop
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, name="worker-event-loop", daemon=True)
+        thread.start()
+        _loop, _thread, _pid = loop, thread, os.getpid()
+        return loop
+
+
+def submit(coro) -> Future:
+    """Schedule ``coro`` on the worker loop from any thread."""
+    return asyncio.run_coroutine_threadsafe(coro, start_worker_loop())
+
+
+def run_async(coro):
+    """Run ``coro`` on the worker loop and block the calling thread until it finishes."""
+    return submit(coro).result()
+
+
+def stop_worker_loop(cleanup=None):
+    """Await ``cleanup()`` on the loop, then stop it. Safe to call more than once."""
+    global _loop, _thread, _pid
+    with _lock:
+        loop, thread = _loop, _thread
+        if loop is None or _pid != os.getpid() or loop.is_closed():
+            return
+        _loop = _thread = _pid = None
+    try:
+        if cleanup is not None:
+            asyncio.run_coroutine_threadsafe(cleanup(), loop).result(timeout=10)
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=10)
+        loop.close()
@@ -1,8 +1,12 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from starlette.middleware.sessions import SessionMiddleware
 
 from app.core.config import settings
+from app.core.http_client import close_http_clients
 from app.api.health import router as health_router
 from app.api.auth.google import router as google_auth_router
 from app.api.users import router as users_router
@@ -12,17 +16,36 @@ from app.api.oauth.youtube import router as youtube_router
 from app.api.transfer.spotify_to_youtube import router as transfer_router
 from app.api.transfer.youtube_to_spotify import router as yt_spotify_router
 from app.api.transfer.status import router as status_router
+from app.api.transfer.progress import router as progress_router
+from app.api.transfer.batch import router as batch_router
 from app.api.youtube.playlists import router as youtube_playlists_router
 from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
 from app.core.middleware import XForwardedHostMiddleware
+from app.core.metrics import MetricsMiddleware, metrics_response
+from app.services.youtube_quota import QuotaExhausted
+
+
+
 
 
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await close_http_clients()
 
 
+app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
 
-app = FastAPI(title=settings.PROJECT_NAME)
+
+@app.exception_handler(QuotaExhausted)
+async def quota_exhausted_handler(request: Request, exc: QuotaExhausted):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "YouTube quota exhausted. Try again later."},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
 
 app.add_middleware(ProxyHeadersMiddleware, trusted_hosts="*")
 app.add_middleware(XForwardedHostMiddleware)
@@ -46,6 +69,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so the recorded latency covers the other middleware too
+app.add_middleware(MetricsMiddleware)
+
+app.add_route("/metrics", metrics_response, include_in_schema=False)
 app.include_router(health_router, prefix="/api")
 app.include_router(
     google_auth_router,
@@ -88,6 +115,18 @@ app.include_router(
     tags=["transfer"],
 )
 
+app.include_router(
+    progress_router,
+    prefix="/api/transfer",
+    tags=["transfer"],
+)
+
+app.include_router(
+    batch_router,
+    prefix="/api/transfer",
+    tags=["transfer"],
+)
+
 
 app.include_router(
     youtube_playlists_router,
@@ -1,9 +1,11 @@
-from sqlalchemy import String, Integer, ForeignKey
+from sqlalchemy import String, Integer, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from app.models.user import Base
 
 class OAuthAccount(Base):
     __tablename__ = "oauth_accounts"
+    # One account per provider per user; also serves lookups by user_id alone
+    __table_args__ = (Index("ix_oauth_accounts_user_provider", "user_id", "provider", unique=True),)
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
@@ -0,0 +1,16 @@
+from sqlalchemy import String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.user import Base
+
+class TrackMatch(Base):
+    __tablename__ = "track_matches"
+    __table_args__ = (UniqueConstraint("direction", "source_key"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    # "spotify_to_youtube" or "youtube_to_spotify"
+    direction: Mapped[str] = mapped_column(String)
+    source_key: Mapped[str] = mapped_column(String)
+
+    # None caches a "not found" result
+    target_id: Mapped[str | None] = mapped_column(nullable=True)
+    expires_at: Mapped[int]
@@ -0,0 +1,84 @@
+from sqlalchemy import JSON, Index, String, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.user import Base
+
+class TransferJob(Base):
+    __tablename__ = "transfer_jobs"
+    # "List my transfers", newest first
+    __table_args__ = (Index("ix_transfer_jobs_user_created", "user_id", "created_at"),)
+
+    # Celery task id; a retried task keeps its id and resumes this job
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
+    # "spotify_to_youtube" or "youtube_to_spotify"
+    direction: Mapped[str]
+    source_playlist_id: Mapped[str]
+    destination_playlist_id: Mapped[str | None] = mapped_column(nullable=True)
+    created_at: Mapped[int]
+
+    # queued -> running -> done / failed; deferred while waiting for YouTube
+    # quota, retrying after an error Celery retries
+    state: Mapped[str] = mapped_column(default="queued", server_default="queued")
+    # Progress counters, saved by the worker every TRANSFER_STATUS_INTERVAL seconds
+    total: Mapped[int] = mapped_column(default=0, server_default="0")
+    searched: Mapped[int] = mapped_column(default=0, server_default="0")
+    processed: Mapped[int] = mapped_column(default=0, server_default="0")
+    matched: Mapped[int] = mapped_column(default=0, server_default="0")
+    skipped: Mapped[int] = mapped_column(default=0, server_default="0")
+    error: Mapped[str | None] = mapped_column(nullable=True)
+    # The task's return value once done
+    result: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    started_at: Mapped[int | None] = mapped_column(nullable=True)
+    updated_at: Mapped[int | None] = mapped_column(nullable=True)
+    finished_at: Mapped[int | None] = mapped_column(nullable=True)
+
+class TransferBatch(Base):
+    __tablename__ = "transfer_batches"
+
+    # Also the task id of the chord callback that sums up the batch
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
+    direction: Mapped[str]
+    # [{"playlist_id", "title", "task_id"}] in request order
+    playlists: Mapped[list] = mapped_column(JSON)
+    created_at: Mapped[int]
+
+class TransferItem(Base):
+    __tablename__ = "transfer_items"
+    __table_args__ = (UniqueConstraint("job_id", "position"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    job_id: Mapped[str] = mapped_column(ForeignKey("transfer_jobs.id"))
+    position: Mapped[int]
+    # Spotify track ID (or "name - artist") / YouTube video title
+    source_item: Mapped[str]
+
+    # Set once the item has been searched; target_id None means no match
+    resolved: Mapped[bool] = mapped_column(default=False)
+    target_id: Mapped[str | None] = mapped_column(nullable=True)
+    inserted: Mapped[bool] = mapped_column(default=False)
+
+class PlaylistSync(Base):
+    __tablename__ = "playlist_syncs"
+    __table_args__ = (UniqueConstraint("user_id", "direction", "source_playlist_id"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    direction: Mapped[str]
+    source_playlist_id: Mapped[str]
+    destination_playlist_id: Mapped[str]
+    # Spotify snapshot the synced tracks were read at; None when the last run
+    # was incomplete or the source (YouTube) has no snapshots
+    source_snapshot_id: Mapped[str | None] = mapped_column(nullable=True)
+    updated_at: Mapped[int]
+
+class SyncedTrack(Base):
+    __tablename__ = "synced_tracks"
+    __table_args__ = (UniqueConstraint("sync_id", "source_key"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    sync_id: Mapped[int] = mapped_column(ForeignKey("playlist_syncs.id"))
+    # Spotify track ID (or "name - artist") / YouTube playlist item ID
+    source_key: Mapped[str]
+    # The inserted video ID / track URI; None when the search found no match
+    target_id: Mapped[str | None] = mapped_column(nullable=True)
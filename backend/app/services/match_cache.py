@@ -0,0 +1,188 @@
+import asyncio
+import logging
+import time
+
+from redis.exceptions import RedisError
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, upsert
+from app.core.metrics import MATCH_CACHE_LOOKUPS
+from app.core.redis import get_redis, redis_lock
+from app.models.track_match import TrackMatch
+from app.services.youtube_parse import normalize_title
+
+logger = logging.getLogger(__name__)
+
+SPOTIFY_TO_YOUTUBE = "spotify_to_youtube"
+YOUTUBE_TO_SPOTIFY = "youtube_to_spotify"
+
+# Redis value for a cached "not found" result
+NOT_FOUND = ""
+
+# Longest one worker may hold the cross-worker lock on a search
+SEARCH_LOCK_MS = 10_000
+
+# (direction, key) -> the search for that key running in this process
+_in_flight: dict[tuple[str, str], asyncio.Task] = {}
+
+
+def query_key(*parts: str) -> str | None:
+    """Cache key for a free-text search, e.g. ``query_key(title, artist)``.
+
+    Returns None when nothing survives normalization (e.g. non-Latin titles),
+    so unrelated searches never share an empty key.
+    """
+    normalized = normalize_title(" ".join(p for p in parts if p))
+    return f"q:{normalized}" if normalized else None
+
+
+def isrc_key(isrc: str) -> str:
+    """Cache key for a recording, shared by every Spotify track ID with this ISRC."""
+    return f"isrc:{isrc.upper()}"
+
+
+def video_key(video_id: str) -> str:
+    return f"video:{video_id}"
+
+
+def _redis_key(direction: str, key: str) -> str:
+    return f"match:{direction}:{key}"
+
+
+def _count(event: str):
+    MATCH_CACHE_LOOKUPS.labels(event).inc()
+
+
+async def _cache_in_redis(direction: str, keys: list[str], target_id: str | None, ttl: int):
+    client = get_redis()
+    if not client or ttl <= 0:
+        return
+    try:
+        async with client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.set(_redis_key(direction, key), target_id or NOT_FOUND, ex=ttl)
+            await pipe.execute()
+    except RedisError as e:
+        logger.warning("match cache: redis write failed: %s", e)
+
+
+async def lookup_match(direction: str, keys: list[str]) -> tuple[bool, str | None]:
+    """Look ``keys`` up in order and return ``(hit, target_id)``.
+
+    A hit with ``target_id`` None is a cached "not found" result.
+    """
+    client = get_redis()
+    if client:
+        try:
+            values = await client.mget([_redis_key(direction, key) for key in keys])
+        except RedisError as e:
+            logger.warning("match cache: redis read failed: %s", e)
+            values = []
+        for value in values:
+            if value is not None:
+                _count("hits" if value else "negative_hits")
+                return True, value or None
+
+    now = int(time.time())
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(TrackMatch).where(
+                TrackMatch.direction == direction,
+                TrackMatch.source_key.in_(keys),
+                TrackMatch.expires_at > now,
+            )
+        )
+        rows = {row.source_key: row for row in result.scalars()}
+
+    for key in keys:
+        row = rows.get(key)
+        if row:
+            await _cache_in_redis(direction, [key], row.target_id, row.expires_at - now)
+            _count("hits" if row.target_id else "negative_hits")
+            return True, row.target_id
+
+    _count("misses")
+    return False, None
+
+
+async def store_match(direction: str, keys: list[str], target_id: str | None):
+    """Remember ``target_id`` (or a "not found" result) for every key in ``keys``."""
+    ttl = settings.MATCH_CACHE_TTL if target_id else settings.MATCH_CACHE_NEGATIVE_TTL
+    expires_at = int(time.time()) + ttl
+
+    stmt = upsert(TrackMatch).values([
+        {"direction": direction, "source_key": key, "target_id": target_id, "expires_at": expires_at}
+        for key in keys
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["direction", "source_key"],
+        set_={"target_id": stmt.excluded.target_id, "expires_at": stmt.excluded.expires_at},
+    )
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.execute(stmt)
+            await db.commit()
+    except SQLAlchemyError as e:
+        logger.warning("match cache: failed to store %s: %s", keys, e)
+
+    await _cache_in_redis(direction, keys, target_id, ttl)
+
+
+async def cached_search(direction: str, keys: list, search):
+    """Return a cached match for ``keys`` or run ``search()`` and cache its result.
+
+    Identical searches are coalesced on the last, most general key (usually
+    the normalized query): concurrent callers in this process share one
+    ``search()`` call, and a worker that finds another worker searching the
+    same key waits for it and reads its result from the cache.
+    """
+    keys = [key for key in keys if key]
+    if not keys:
+        return await search()
+    flight = (direction, keys[-1])
+    task = _in_flight.get(flight)
+    if task is None or task.get_loop() is not asyncio.get_running_loop():
+        # A task of its own, so a cancelled caller does not cancel the others
+        task = asyncio.ensure_future(_lookup_or_search(direction, keys, search))
+        _in_flight[flight] = task
+        task.add_done_callback(lambda done: _landed(flight, done))
+    else:
+        _count("coalesced")
+    return await asyncio.shield(task)
+
+
+def _landed(flight: tuple[str, str], task: asyncio.Task):
+    if _in_flight.get(flight) is task:
+        del _in_flight[flight]
+    if not task.cancelled():
+        # Retrieved here in case every caller was cancelled meanwhile
+        task.exception()
+
+
+async def _lookup_or_search(direction: str, keys: list[str], search):
+    hit, target_id = await lookup_match(direction, keys)
+    if hit:
+        return target_id
+
+    async def published():
+        client = get_redis()
+        if not client:
+            return False
+        try:
+            return bool(await client.exists(_redis_key(direction, keys[-1])))
+        except RedisError:
+            return False
+
+    lock_key = f"{_redis_key(direction, keys[-1])}:lock"
+    async with redis_lock(lock_key, SEARCH_LOCK_MS, done=published) as contended:
+        # Another worker ran this search while we waited, or just before we locked
+        if contended or await published():
+            hit, target_id = await lookup_match(direction, keys)
+            if hit:
+                _count("coalesced")
+                return target_id
+        target_id = await search()
+        await store_match(direction, keys, target_id)
+        return target_id
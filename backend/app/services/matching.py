@@ -0,0 +1,171 @@
+import re
+import string
+from dataclasses import dataclass
+from functools import lru_cache
+
+_BRACKETS = re.compile(r"[\(\[][^\]\)\n]*[\)\]]")
+_PUNCTUATION = re.compile(r"[^\w\s]")
+# ASCII text is lowercased with "[" and "]" folded into "(" and ")", so that
+# _BRACKETS becomes a pattern with a literal first character, which re scans
+# for far faster; _PUNCTUATION is then one bytes.translate pass. Neither
+# pattern crosses a newline, so joined titles strip like separate ones.
+_ASCII_FOLD = bytes.maketrans(
+    string.ascii_uppercase.encode() + b"[]",
+    string.ascii_lowercase.encode() + b"()",
+)
+_ASCII_BRACKETS = re.compile(rb"\([^)\n]*\)")
+_ASCII_PUNCTUATION = bytes(c for c in range(128) if _PUNCTUATION.match(chr(c)))
+
+# A candidate must score above this to count as a match
+MATCH_THRESHOLD = 0.5
+
+# Weight of the optional signals relative to title token overlap (weight 1)
+ARTIST_WEIGHT = 0.5
+DURATION_WEIGHT = 0.5
+# Durations this far apart or more get no credit from the duration signal
+DURATION_TOLERANCE_MS = 15_000
+# Durations this close mark the same recording, enough to trust a top search result
+DURATION_CONFIDENT_MS = 2_000
+
+
+def _strip(text: str) -> str:
+    """Lowercase, drop bracketed parts like "(Official Video)" and punctuation."""
+    if text.isascii():
+        folded = text.encode().translate(_ASCII_FOLD)
+        if b"(" in folded:
+            folded = _ASCII_BRACKETS.sub(b"", folded)
+        return folded.translate(None, _ASCII_PUNCTUATION).decode()
+    if "(" in text or "[" in text:
+        text = _BRACKETS.sub("", text)
+    return _PUNCTUATION.sub("", text.casefold())
+
+
+@lru_cache(maxsize=4096)
+def _name_tokens(name: str) -> frozenset[str]:
+    # Artist and channel names repeat a lot across searches; titles rarely do
+    return frozenset(_strip(name).split())
+
+
+def _strip_all(titles: list[str]) -> list[str]:
+    """``_strip`` of every title, as one pass over the joined text."""
+    lines = _strip("\n".join(titles)).split("\n")
+    if len(lines) != len(titles):
+        # A title spanned several lines
+        return [_strip(title) for title in titles]
+    return lines
+
+
+@dataclass
+class PreparedTrack:
+    """A source track normalized and tokenized once, ready to score candidates against."""
+
+    normalized_title: str
+    # The title's tokens, plus the artist's with ``include_artist``
+    tokens: frozenset[str]
+    artist_tokens: frozenset[str]
+    duration_ms: int | None = None
+
+
+def prepare_track(
+    title: str,
+    artist: str = "",
+    duration_ms: int | None = None,
+    include_artist: bool = True,
+) -> PreparedTrack:
+    """Prepare a source track for scoring.
+
+    With ``include_artist`` the artist's words count towards title overlap, which
+    suits YouTube, where video titles usually carry the artist name.
+    """
+    words = _strip(title).split()
+    artist_tokens = _name_tokens(artist) if artist else frozenset()
+    tokens = frozenset(words)
+    if include_artist:
+        tokens |= artist_tokens
+    return PreparedTrack(" ".join(words), tokens, artist_tokens, duration_ms)
+
+
+def best_match(
+    track: PreparedTrack,
+    candidates: list[dict],
+    threshold: float = MATCH_THRESHOLD,
+    exact_title_wins: bool = False,
+) -> tuple[int | None, float]:
+    """Return ``(index, score)`` of the best ``{"title", "artist"?, "duration_ms"?}``
+    candidate scoring above ``threshold``; scores are in [0, 1].
+
+    With ``exact_title_wins`` the first candidate whose normalized title equals
+    the track's is taken outright. The index is None when nothing qualifies.
+    """
+    stripped = _strip_all([candidate["title"] for candidate in candidates])
+    return _best_of(track, candidates, stripped, threshold, exact_title_wins)
+
+
+def best_matches(
+    tracks: list[PreparedTrack],
+    candidate_lists: list[list[dict]],
+    threshold: float = MATCH_THRESHOLD,
+    exact_title_wins: bool = False,
+) -> list[tuple[int | None, float]]:
+    """``best_match`` for many tracks at once, e.g. a page of search results.
+
+    Every candidate title is normalized in a single pass before scoring.
+    """
+    stripped = _strip_all([candidate["title"] for candidates in candidate_lists for candidate in candidates])
+    results, start = [], 0
+    for track, candidates in zip(tracks, candidate_lists):
+        end = start + len(candidates)
+        results.append(_best_of(track, candidates, stripped[start:end], threshold, exact_title_wins))
+        start = end
+    return results
+
+
+def _best_of(
+    track: PreparedTrack,
+    candidates: list[dict],
+    stripped: list[str],
+    threshold: float,
+    exact_title_wins: bool,
+) -> tuple[int | None, float]:
+    # Scored inline with the track's fields and set methods in locals: this loop is the hot path
+    tokens, artist_tokens, duration_ms = track.tokens, track.artist_tokens, track.duration_ms
+    if not tokens and not exact_title_wins:
+        return None, 0.0
+    # The set methods take each candidate's word list as is: building a set
+    # of it first costs more than it saves
+    overlap, missing_from = tokens.intersection, artist_tokens.difference
+    token_count, artist_count = len(tokens), len(artist_tokens)
+    # Most the artist and duration signals can add; a candidate whose title
+    # overlap cannot beat the best score even with full credit is skipped
+    extra = (ARTIST_WEIGHT if artist_count else 0.0) + (DURATION_WEIGHT if duration_ms else 0.0)
+    best_index, best_score = None, 0.0
+    for index, text in enumerate(stripped):
+        words = text.split()
+        if exact_title_wins and " ".join(words) == track.normalized_title:
+            return index, 1.0
+        if not token_count:
+            continue
+        total = len(overlap(words)) / token_count
+        if total + extra <= best_score * (1 + extra):
+            continue
+        candidate = candidates[index]
+        weight = 1.0
+        if artist_count and (artist := candidate.get("artist")):
+            # Candidate titles often carry the artist too ("Artist - Song")
+            missing = missing_from(words)
+            if missing:
+                missing -= _name_tokens(artist)
+            total += ARTIST_WEIGHT * (1 - len(missing) / artist_count)
+            weight += ARTIST_WEIGHT
+        if duration_ms and (candidate_ms := candidate.get("duration_ms")):
+            total += DURATION_WEIGHT * max(0.0, 1 - abs(duration_ms - candidate_ms) / DURATION_TOLERANCE_MS)
+            weight += DURATION_WEIGHT
+        score = total / weight
+        if score > best_score:
+            best_index, best_score = index, score
+            if score >= 1.0 and not exact_title_wins:
+                # Nothing later can score higher, and only an exact title would win outright
+                break
+    if best_score > threshold:
+        return best_index, best_score
+    return None, best_score
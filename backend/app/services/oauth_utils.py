@@ -1,10 +1,14 @@
 import time
 import httpx
 from fastapi import HTTPException
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.core.config import settings
+from app.core.metrics import TOKEN_REFRESHES
 from app.models.oauth_account import OAuthAccount
+from app.services.token_cache import cache_token, get_cached_token, refresh_lock
 
 
 async def refresh_access_token(db: AsyncSession, account: OAuthAccount) -> OAuthAccount:
@@ -61,8 +65,71 @@ async def refresh_access_token(db: AsyncSession, account: OAuthAccount) -> OAuth
     return account
 
 
+def _apply_cached(account: OAuthAccount, cached: tuple[str, int]) -> OAuthAccount:
+    # Another request already refreshed and committed this token; reflect it
+    # without marking the row dirty.
+    set_committed_value(account, "access_token", cached[0])
+    set_committed_value(account, "expires_at", cached[1])
+    return account
+
+
 async def ensure_token_valid(db: AsyncSession, account: OAuthAccount) -> OAuthAccount:
-    """Return a valid account, refreshing access token if it is expired."""
-    if account.expires_at and account.expires_at < int(time.time()) + 60:
-        return await refresh_access_token(db, account)
+    """Return a valid account, refreshing access token if it is expired.
+
+    Refreshes are single-flight per (user, provider): concurrent callers wait
+    for the one refresh in progress and reuse its token via the token cache.
+    """
+    if account.expires_at and account.expires_at >= int(time.time()) + 60:
+        await cache_token(account.user_id, account.provider, account.access_token, account.expires_at)
+        return account
+
+    cached = await get_cached_token(account.user_id, account.provider)
+    if cached:
+        return _apply_cached(account, cached)
+
+    async with refresh_lock(account.user_id, account.provider):
+        cached = await get_cached_token(account.user_id, account.provider)
+        if cached:
+            TOKEN_REFRESHES.labels(account.provider, "shared").inc()
+            return _apply_cached(account, cached)
+        # Pick up a refresh token another worker may have rotated meanwhile
+        await db.refresh(account)
+        try:
+            account = await refresh_access_token(db, account)
+        except Exception:
+            TOKEN_REFRESHES.labels(account.provider, "failed").inc()
+            raise
+        TOKEN_REFRESHES.labels(account.provider, "refreshed").inc()
+        await cache_token(account.user_id, account.provider, account.access_token, account.expires_at)
     return account
+
+
+async def load_user_accounts(db: AsyncSession, user_id: int) -> dict[str, OAuthAccount]:
+    """Load all of a user's connected accounts in one query, keyed by provider."""
+    result = await db.execute(select(OAuthAccount).where(OAuthAccount.user_id == user_id))
+    return {account.provider: account for account in result.scalars()}
+
+
+async def get_access_tokens(db: AsyncSession, user_id: int, providers: list[str]) -> dict[str, str | None]:
+    """Return a valid access token per provider, None for providers not connected.
+
+    Tokens come from the token cache when possible; any misses are loaded
+    together with a single query.
+    """
+    tokens = {}
+    for provider in providers:
+        cached = await get_cached_token(user_id, provider)
+        tokens[provider] = cached[0] if cached else None
+    missing = [provider for provider, token in tokens.items() if token is None]
+    if missing:
+        accounts = await load_user_accounts(db, user_id)
+        for provider in missing:
+            if provider in accounts:
+                account = await ensure_token_valid(db, accounts[provider])
+                tokens[provider] = account.access_token
+    return tokens
+
+
+async def get_access_token(db: AsyncSession, user_id: int, provider: str) -> str | None:
+    """Return a valid access token for the user's provider account, or None if not connected."""
+    return (await get_access_tokens(db, user_id, [provider]))[provider]
@@ -0,0 +1,74 @@
+import hashlib
+import json
+import logging
+import time
+
+from fastapi import Request, Response
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Entries outlive their freshness window so stale YouTube pages can still be
+# revalidated with their ETags instead of being downloaded again
+ENTRY_TTL = 24 * 3600
+
+
+def _key(provider: str, user_id: int) -> str:
+    return f"playlists:{provider}:{user_id}"
+
+
+async def get_cached_playlists(provider: str, user_id: int) -> tuple[dict | None, bool]:
+    """Return ``(entry, fresh)``; entry is None on a miss or without Redis.
+
+    ``fresh`` is False once ``PLAYLIST_CACHE_TTL`` has passed: the entry may
+    then only be used to revalidate against the provider.
+    """
+    client = get_redis()
+    if not client:
+        return None, False
+    try:
+        raw = await client.get(_key(provider, user_id))
+    except RedisError as e:
+        logger.warning("playlist cache: redis read failed: %s", e)
+        return None, False
+    if not raw:
+        return None, False
+    entry = json.loads(raw)
+    return entry, entry["cached_at"] + settings.PLAYLIST_CACHE_TTL > time.time()
+
+
+async def store_playlists(provider: str, user_id: int, playlists: list, **extra):
+    """Cache the listing; ``extra`` holds provider data such as YouTube page ETags."""
+    client = get_redis()
+    if not client:
+        return
+    entry = {"cached_at": time.time(), "playlists": playlists, **extra}
+    try:
+        await client.set(_key(provider, user_id), json.dumps(entry), ex=ENTRY_TTL)
+    except RedisError as e:
+        logger.warning("playlist cache: redis write failed: %s", e)
+
+
+async def invalidate_playlists(provider: str, user_id: int):
+    """Drop the cached listing, e.g. after a transfer created a playlist."""
+    client = get_redis()
+    if not client:
+        return
+    try:
+        await client.delete(_key(provider, user_id))
+    except RedisError as e:
+        logger.warning("playlist cache: redis delete failed: %s", e)
+
+
+def conditional_json(request: Request, content) -> Response:
+    """JSON response with an ETag; 304 when the client already has this version."""
+    body = json.dumps(content, separators=(",", ":")).encode()
+    etag = f'"{hashlib.sha1(body).hexdigest()}"'
+    # Revalidate every time; the 304 keeps that nearly free
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
@@ -0,0 +1,95 @@
+import logging
+import time
+from dataclasses import dataclass, field
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.database import AsyncSessionLocal, upsert
+from app.models.transfer import PlaylistSync, SyncedTrack
+
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT when saving synced tracks
+SAVE_CHUNK = 500
+
+
+@dataclass
+class SyncState:
+    """What earlier transfers of one source playlist left in its destination."""
+
+    destination_playlist_id: str | None = None
+    snapshot_id: str | None = None
+    # source key -> inserted target ID, or None for a track that found no match
+    tracks: dict[str, str | None] = field(default_factory=dict)
+
+    def unchanged(self, snapshot_id: str | None) -> bool:
+        return bool(self.destination_playlist_id and snapshot_id and snapshot_id == self.snapshot_id)
+
+
+async def load_sync(user_id: int, direction: str, source_playlist_id: str) -> SyncState:
+    """The stored mapping for a source playlist; empty if it was never transferred."""
+    async with AsyncSessionLocal() as db:
+        row = await db.scalar(
+            select(PlaylistSync).where(
+                PlaylistSync.user_id == user_id,
+                PlaylistSync.direction == direction,
+                PlaylistSync.source_playlist_id == source_playlist_id,
+            )
+        )
+        if not row:
+            return SyncState()
+        result = await db.execute(
+            select(SyncedTrack.source_key, SyncedTrack.target_id).where(SyncedTrack.sync_id == row.id)
+        )
+        return SyncState(row.destination_playlist_id, row.source_snapshot_id, dict(result.all()))
+
+
+async def record_sync(
+    user_id: int,
+    direction: str,
+    source_playlist_id: str,
+    destination_playlist_id: str,
+    tracks: dict[str, str | None],
+    snapshot_id: str | None = None,
+):
+    """Save the source -> destination mapping and the tracks a transfer resolved.
+
+    A new destination replaces the old mapping along with its tracks. Failures
+    are logged rather than raised: the transfer itself has already succeeded,
+    and the next sync merely diffs against an older state.
+    """
+    try:
+        async with AsyncSessionLocal() as db:
+            row = await db.scalar(
+                select(PlaylistSync).where(
+                    PlaylistSync.user_id == user_id,
+                    PlaylistSync.direction == direction,
+                    PlaylistSync.source_playlist_id == source_playlist_id,
+                )
+            )
+            if not row:
+                row = PlaylistSync(
+                    user_id=user_id,
+                    direction=direction,
+                    source_playlist_id=source_playlist_id,
+                    destination_playlist_id=destination_playlist_id,
+                )
+                db.add(row)
+            elif row.destination_playlist_id != destination_playlist_id:
+                await db.execute(delete(SyncedTrack).where(SyncedTrack.sync_id == row.id))
+                row.destination_playlist_id = destination_playlist_id
+            row.source_snapshot_id = snapshot_id
+            row.updated_at = int(time.time())
+            await db.flush()
+
+            values = [{"sync_id": row.id, "source_key": key, "target_id": target} for key, target in tracks.items()]
+            for start in range(0, len(values), SAVE_CHUNK):
+                stmt = upsert(SyncedTrack).values(values[start:start + SAVE_CHUNK])
+                await db.execute(stmt.on_conflict_do_update(
+                    index_elements=["sync_id", "source_key"],
+                    set_={"target_id": stmt.excluded.target_id},
+                ))
+            await db.commit()
+    except SQLAlchemyError as e:
+        logger.warning("Could not save sync state of playlist %s for user %s: %s", source_playlist_id, user_id, e)
@@ -0,0 +1,254 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from itertools import islice
+
+import httpx
+
+from app.core.config import settings
+from app.core.http_client import get_http_client, send_request
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = settings.SPOTIFY_API_BASE_URL
+
+# Most URIs the API accepts in one "add items to playlist" request
+MAX_ITEMS_PER_ADD = 100
+
+
+class SpotifyAPIError(Exception):
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"Spotify API error {status_code}: {message}")
+        self.status_code = status_code
+
+
+def get_spotify_client() -> httpx.AsyncClient:
+    return get_http_client("spotify", BASE_URL)
+
+
+async def spotify_request(access_token: str, method: str, path: str, endpoint: str | None = None, **kwargs) -> dict:
+    """Call the Spotify Web API through the shared per-process client.
+
+    ``path`` may be relative to ``BASE_URL`` or an absolute ``next`` URL from a
+    paged response; ``endpoint`` is the label latency is recorded under.
+    """
+    headers = {"Authorization": f"Bearer {access_token}", **kwargs.pop("headers", {})}
+    r = await send_request(
+        get_spotify_client(),
+        "spotify",
+        endpoint or path,
+        method,
+        path,
+        headers=headers,
+        **kwargs,
+    )
+    if r.status_code >= 400:
+        try:
+            message = r.json()["error"]["message"]
+        except (ValueError, KeyError, TypeError):
+            message = r.text
+        raise SpotifyAPIError(r.status_code, message)
+    return r.json() if r.content else {}
+
+
+async def iter_pages(
+    access_token: str,
+    path: str,
+    endpoint: str | None = None,
+    limit: int = 50,
+    params: dict | None = None,
+):
+    """Yield ``(items, total)`` for every page of an offset-paged endpoint, in order.
+
+    The first page reveals ``total``; the remaining offsets are then fetched
+    ahead of the consumer, at most ``SPOTIFY_PAGE_CONCURRENCY`` at a time, so
+    pages arrive while earlier ones are still being processed.
+    """
+    params = {**(params or {}), "limit": limit}
+    first = await spotify_request(access_token, "GET", path, endpoint=endpoint, params={**params, "offset": 0})
+    total = first.get("total", 0)
+    yield first["items"], total
+
+    # The API may cap the page size below what was asked for
+    page_size = first.get("limit") or limit
+    offsets = iter(range(page_size, total, page_size))
+
+    def fetch(offset: int) -> asyncio.Task:
+        return asyncio.create_task(spotify_request(
+            access_token, "GET", path, endpoint=endpoint, params={**params, "limit": page_size, "offset": offset}
+        ))
+
+    in_flight = deque(fetch(offset) for offset in islice(offsets, settings.SPOTIFY_PAGE_CONCURRENCY))
+    try:
+        while in_flight:
+            page = await in_flight.popleft()
+            for offset in islice(offsets, 1):
+                in_flight.append(fetch(offset))
+            yield page["items"], total
+    finally:
+        for task in in_flight:
+            task.cancel()
+
+
+async def get_all_pages(
+    access_token: str,
+    path: str,
+    endpoint: str | None = None,
+    limit: int = 50,
+    params: dict | None = None,
+) -> list[dict]:
+    """Return the items of every page of an offset-paged endpoint, in order."""
+    return [item async for items, _ in iter_pages(access_token, path, endpoint, limit, params) for item in items]
+
+
+async def get_user_playlists(access_token: str) -> list[dict]:
+    return await get_all_pages(access_token, "me/playlists", limit=50)
+
+
+async def search_tracks(access_token: str, q: str, limit: int = 10) -> list[dict]:
+    data = await spotify_request(
+        access_token,
+        "GET",
+        "search",
+        params={"q": q, "type": "track", "limit": limit},
+    )
+    return data["tracks"]["items"]
+
+
+async def get_playlist_snapshot(access_token: str, playlist_id: str) -> str | None:
+    """The playlist's current snapshot ID, which changes whenever its items do."""
+    data = await spotify_request(
+        access_token,
+        "GET",
+        f"playlists/{playlist_id}",
+        endpoint="playlists",
+        params={"fields": "snapshot_id"},
+    )
+    return data.get("snapshot_id")
+
+
+async def create_playlist(access_token: str, name: str, public: bool = False) -> str:
+    data = await spotify_request(
+        access_token,
+        "POST",
+        "me/playlists",
+        json={"name": name, "public": public, "collaborative": False, "description": ""},
+    )
+    return data["id"]
+
+
+async def add_items_to_playlist(access_token: str, playlist_id: str, uris: list[str]) -> str:
+    """Append up to MAX_ITEMS_PER_ADD track URIs to a playlist and return the new snapshot ID."""
+    data = await spotify_request(
+        access_token,
+        "POST",
+        f"playlists/{playlist_id}/items",
+        endpoint="playlists/items.add",
+        json={"uris": uris},
+    )
+    return data.get("snapshot_id")
+
+
+class PlaylistWriter:
+    """Appends track URIs to a Spotify playlist in order, in the background.
+
+    URIs passed to ``add`` are buffered into chunks of MAX_ITEMS_PER_ADD and
+    written one chunk at a time while the caller keeps producing matches; at
+    most ``max_queued`` full chunks wait, after which ``add`` blocks. Chunks
+    that fail (after ``send_request``'s own retries) are recorded in ``failed``
+    and later chunks are still written.
+    ``on_written``, if given, is awaited with the keys of each written chunk;
+    an error it raises is recorded in ``errors`` and does not stop the writer.
+    ``write_seconds`` holds the duration of every write request.
+    """
+
+    def __init__(
+        self,
+        access_token: str,
+        playlist_id: str,
+        on_written=None,
+        max_queued: int = 2,
+    ):
+        self.access_token = access_token
+        self.playlist_id = playlist_id
+        self.on_written = on_written
+        self.snapshot_ids: list[str] = []
+        self.written = 0
+        self.failed: list[str] = []
+        self.errors: list[str] = []
+        self.write_seconds: list[float] = []
+        self._pending: list[tuple] = []
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+        self._task = asyncio.create_task(self._run())
+
+    @property
+    def snapshot_id(self) -> str | None:
+        return self.snapshot_ids[-1] if self.snapshot_ids else None
+
+    async def add(self, uri: str, key=None):
+        self._pending.append((uri, key))
+        if len(self._pending) >= MAX_ITEMS_PER_ADD:
+            await self._put(self._pending)
+            self._pending = []
+
+    async def close(self):
+        """Flush the last partial chunk and wait for every write to finish."""
+        if self._pending:
+            await self._put(self._pending)
+            self._pending = []
+        await self._put(None)
+        await self._task
+
+    async def abort(self):
+        """Drop the unwritten chunks and wait for a write already in flight; a no-op once closed.
+
+        The in-flight POST is not cancelled, since it may already have been
+        applied, so its ``on_written`` still records the chunk.
+        """
+        if self._task.done():
+            return
+        self._pending = []
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        await self._queue.put(None)
+        await self._task
+
+    async def _put(self, chunk: list[tuple] | None):
+        # A stopped writer never drains the queue: raise its error rather than block on a full queue
+        if self._task.done():
+            self._task.result()
+            raise RuntimeError("Spotify playlist writer has stopped")
+        await self._queue.put(chunk)
+
+    async def _run(self):
+        while (chunk := await self._queue.get()) is not None:
+            try:
+                await self._write(chunk)
+            except Exception as e:
+                # e.g. ``on_written`` failing to save; later chunks are still written
+                logger.warning("Spotify playlist write failed: %s", e)
+                self.errors.append(str(e))
+
+    async def _add(self, uris: list[str]) -> str:
+        start = time.perf_counter()
+        try:
+            return await add_items_to_playlist(self.access_token, self.playlist_id, uris)
+        finally:
+            self.write_seconds.append(time.perf_counter() - start)
+
+    async def _write(self, chunk: list[tuple]):
+        uris = [uri for uri, _ in chunk]
+        try:
+            # Not retried here: send_request already retries throttling, and
+            # other failures only where the POST was never sent, since a
+            # resent chunk would be appended twice
+            snapshot_id = await self._add(uris)
+        except Exception as e:
+            self.failed.extend(uris)
+            self.errors.append(str(e))
+            return
+        self.snapshot_ids.append(snapshot_id)
+        self.written += len(uris)
+        if self.on_written:
+            await self.on_written([key for _, key in chunk])
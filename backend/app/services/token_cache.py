@@ -0,0 +1,114 @@
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis import get_redis, redis_lock
+
+logger = logging.getLogger(__name__)
+
+# Tokens this close to expiry are treated as expired
+EXPIRY_MARGIN = 60
+
+# How long one worker may hold the cross-worker refresh lock
+REFRESH_LOCK_MS = 15_000
+
+# (user_id, provider) -> (access_token, expires_at, cached at), least recently used first
+_tokens: OrderedDict[tuple[int, str], tuple[str, int, float]] = OrderedDict()
+# (user_id, provider) -> (lock, callers holding or waiting for it)
+_refresh_locks: dict[tuple[int, str], tuple[asyncio.Lock, int]] = {}
+
+
+def _redis_key(key: tuple[int, str]) -> str:
+    return f"oauth_token:{key[0]}:{key[1]}"
+
+
+def _is_fresh(expires_at: int | None) -> bool:
+    return bool(expires_at) and expires_at >= int(time.time()) + EXPIRY_MARGIN
+
+
+def _remember_locally(key: tuple[int, str], access_token: str, expires_at: int):
+    _tokens[key] = (access_token, expires_at, time.monotonic())
+    _tokens.move_to_end(key)
+    while len(_tokens) > settings.TOKEN_CACHE_SIZE:
+        _tokens.popitem(last=False)
+
+
+async def get_cached_token(user_id: int, provider: str) -> tuple[str, int] | None:
+    """Return a still-valid ``(access_token, expires_at)`` from this process or Redis.
+
+    In-process entries are trusted for only ``TOKEN_LOCAL_TTL`` seconds: a
+    reconnect through the OAuth callback replaces the token in Redis and the
+    database, which other processes then pick up.
+    """
+    key = (user_id, provider)
+    entry = _tokens.get(key)
+    if entry and _is_fresh(entry[1]) and time.monotonic() - entry[2] < settings.TOKEN_LOCAL_TTL:
+        _tokens.move_to_end(key)
+        return entry[0], entry[1]
+
+    client = get_redis()
+    if not client:
+        return None
+    try:
+        raw = await client.get(_redis_key(key))
+    except RedisError as e:
+        logger.warning("token cache: redis read failed: %s", e)
+        return None
+    if not raw:
+        return None
+    data = json.loads(raw)
+    if not _is_fresh(data["expires_at"]):
+        return None
+    _remember_locally(key, data["access_token"], data["expires_at"])
+    return data["access_token"], data["expires_at"]
+
+
+async def cache_token(user_id: int, provider: str, access_token: str, expires_at: int):
+    key = (user_id, provider)
+    _remember_locally(key, access_token, expires_at)
+    client = get_redis()
+    ttl = expires_at - int(time.time()) - EXPIRY_MARGIN
+    if not client or ttl <= 0:
+        return
+    try:
+        await client.set(
+            _redis_key(key),
+            json.dumps({"access_token": access_token, "expires_at": expires_at}),
+            ex=ttl,
+        )
+    except RedisError as e:
+        logger.warning("token cache: redis write failed: %s", e)
+
+
+@asynccontextmanager
+async def refresh_lock(user_id: int, provider: str):
+    """Serialize refreshes of one account, within this process and across workers.
+
+    Callers should re-check ``get_cached_token`` once inside: whoever held the
+    lock before them has usually refreshed the token already.
+    """
+    key = (user_id, provider)
+    lock, users = _refresh_locks.get(key, (asyncio.Lock(), 0))
+    _refresh_locks[key] = (lock, users + 1)
+
+    async def refreshed():
+        # Another worker is refreshing; stop waiting once it has published the token
+        return await get_cached_token(user_id, provider) is not None
+
+    try:
+        async with lock:
+            async with redis_lock(f"{_redis_key(key)}:refresh", REFRESH_LOCK_MS, done=refreshed):
+                yield
+    finally:
+        # Drop the lock once no caller holds or waits for it
+        lock, users = _refresh_locks[key]
+        if users > 1:
+            _refresh_locks[key] = (lock, users - 1)
+        else:
+            del _refresh_locks[key]
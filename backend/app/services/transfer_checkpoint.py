@@ -0,0 +1,144 @@
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import select, update
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, upsert
+from app.models.transfer import TransferItem, TransferJob
+
+
+@dataclass
+class CheckpointItem:
+    position: int
+    source_item: str
+    resolved: bool = False
+    target_id: str | None = None
+    inserted: bool = False
+
+
+class TransferCheckpoint:
+    """Per-track progress of one transfer job, persisted in ``transfer_items``.
+
+    Celery keeps the task id when a task is retried or redelivered, so loading
+    the checkpoint for that id picks up the previous attempt's resolved matches,
+    inserted flags and destination playlist. Loading also marks the job
+    running. Source tracks are registered with ``add`` as their pages are
+    fetched. ``db_seconds`` sums the time spent saving.
+    """
+
+    def __init__(self, job: TransferJob, stored: dict[int, TransferItem], resumed: bool):
+        self.job_id = job.id
+        self.destination_playlist_id = job.destination_playlist_id
+        self.items: list[CheckpointItem] = []
+        self.resumed = resumed
+        self._stored = stored
+        self._dirty: set[int] = set()
+        self.db_seconds = 0.0
+
+    @classmethod
+    async def load(
+        cls,
+        job_id: str,
+        user_id: int,
+        direction: str,
+        source_playlist_id: str,
+    ) -> "TransferCheckpoint":
+        now = int(time.time())
+        async with AsyncSessionLocal() as db:
+            # The API adds the row when it queues the task; a task sent some
+            # other way adds its own
+            job = await db.get(TransferJob, job_id)
+            stored = {}
+            if not job:
+                job = TransferJob(
+                    id=job_id,
+                    user_id=user_id,
+                    direction=direction,
+                    source_playlist_id=source_playlist_id,
+                    created_at=now,
+                )
+                db.add(job)
+            else:
+                result = await db.execute(select(TransferItem).where(TransferItem.job_id == job_id))
+                stored = {row.position: row for row in result.scalars()}
+            resumed = job.started_at is not None or bool(stored)
+            job.state = "running"
+            job.started_at = job.started_at or now
+            job.finished_at = job.error = None
+            job.updated_at = now
+            await db.commit()
+        return cls(job, stored, resumed)
+
+    def add(self, source_item: str) -> CheckpointItem:
+        """Register the next source track, restoring its state from a previous attempt."""
+        position = len(self.items)
+        row = self._stored.pop(position, None)
+        # Positions whose source track changed since the last attempt start over
+        if row and row.source_item == source_item:
+            item = CheckpointItem(position, source_item, row.resolved, row.target_id, row.inserted)
+        else:
+            item = CheckpointItem(position, source_item)
+        self.items.append(item)
+        return item
+
+    def inserted_count(self) -> int:
+        return sum(1 for item in self.items if item.inserted)
+
+    async def set_destination(self, playlist_id: str):
+        start = time.perf_counter()
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(TransferJob)
+                .where(TransferJob.id == self.job_id)
+                .values(destination_playlist_id=playlist_id)
+            )
+            await db.commit()
+        self.db_seconds += time.perf_counter() - start
+        self.destination_playlist_id = playlist_id
+
+    async def resolve(self, position: int, target_id: str | None):
+        """Record a search result; saved in batches of CHECKPOINT_INTERVAL."""
+        item = self.items[position]
+        item.resolved = True
+        item.target_id = target_id
+        self._dirty.add(position)
+        if len(self._dirty) >= settings.CHECKPOINT_INTERVAL:
+            await self.flush()
+
+    async def mark_inserted(self, positions: list[int]):
+        """Record written items and save immediately, so a resume never re-inserts them."""
+        for position in positions:
+            self.items[position].inserted = True
+            self._dirty.add(position)
+        await self.flush()
+
+    async def flush(self):
+        if not self._dirty:
+            return
+        positions, self._dirty = self._dirty, set()
+        stmt = upsert(TransferItem).values([
+            {
+                "job_id": self.job_id,
+                "position": item.position,
+                "source_item": item.source_item,
+                "resolved": item.resolved,
+                "target_id": item.target_id,
+                "inserted": item.inserted,
+            }
+            for item in (self.items[position] for position in sorted(positions))
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["job_id", "position"],
+            set_={
+                "source_item": stmt.excluded.source_item,
+                "resolved": stmt.excluded.resolved,
+                "target_id": stmt.excluded.target_id,
+                "inserted": stmt.excluded.inserted,
+            },
+        )
+        start = time.perf_counter()
+        async with AsyncSessionLocal() as db:
+            await db.execute(stmt)
+            await db.commit()
+        self.db_seconds += time.perf_counter() - start
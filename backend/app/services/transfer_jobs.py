@@ -0,0 +1,69 @@
+import logging
+import time
+
+from sqlalchemy import update
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.database import AsyncSessionLocal
+from app.models.transfer import TransferJob
+
+logger = logging.getLogger(__name__)
+
+# Job state -> the Celery state name the status endpoint has always reported
+TASK_STATUS = {
+    "queued": "PENDING",
+    "running": "STARTED",
+    "deferred": "RETRY",
+    "retrying": "RETRY",
+    "done": "SUCCESS",
+    "failed": "FAILURE",
+}
+
+FINAL_STATES = {"done", "failed"}
+
+COUNTERS = ("total", "searched", "processed", "matched", "skipped")
+
+
+def new_job(job_id: str, user_id: int, direction: str, source_playlist_id: str) -> TransferJob:
+    """Row of a queued transfer; added before its task is sent, so status reads find it at once."""
+    return TransferJob(
+        id=job_id,
+        user_id=user_id,
+        direction=direction,
+        source_playlist_id=source_playlist_id,
+        created_at=int(time.time()),
+    )
+
+
+async def update_job(job_id: str, **values):
+    """Save ``values`` to a job's row; logged rather than raised, so status bookkeeping never fails a transfer."""
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(TransferJob)
+                .where(TransferJob.id == job_id)
+                .values(**values, updated_at=int(time.time()))
+            )
+            await db.commit()
+    except SQLAlchemyError as e:
+        logger.warning("transfer jobs: could not update %s: %s", job_id, e)
+
+
+def job_status(job: TransferJob, include_result: bool = True) -> dict:
+    status = {
+        "task_id": job.id,
+        "task_status": TASK_STATUS.get(job.state, "PENDING"),
+        "state": job.state,
+        "direction": job.direction,
+        "source_playlist_id": job.source_playlist_id,
+        "destination_playlist_id": job.destination_playlist_id,
+        **{name: getattr(job, name) for name in COUNTERS},
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "updated_at": job.updated_at,
+        "finished_at": job.finished_at,
+    }
+    if include_result:
+        status["task_result"] = job.result
+    return status
@@ -0,0 +1,94 @@
+import json
+import logging
+import time
+
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.services.transfer_jobs import update_job
+
+logger = logging.getLogger(__name__)
+
+# Latest snapshot is kept so subscribers that connect mid-transfer start with current counts
+SNAPSHOT_TTL = 24 * 3600
+
+# Stages after which no further events are published for a job
+FINAL_STAGES = {"done", "failed"}
+
+
+def progress_channel(job_id: str) -> str:
+    return f"transfer:progress:{job_id}"
+
+
+def snapshot_key(job_id: str) -> str:
+    return f"transfer:progress:{job_id}:latest"
+
+
+async def publish_progress(job_id: str, event: dict):
+    """Publish ``event`` for ``job_id`` on Redis pub/sub; a no-op without Redis."""
+    client = get_redis()
+    if not client:
+        return
+    payload = json.dumps(event)
+    try:
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.set(snapshot_key(job_id), payload, ex=SNAPSHOT_TTL)
+            pipe.publish(progress_channel(job_id), payload)
+            await pipe.execute()
+    except RedisError as e:
+        logger.warning("transfer progress: publish failed for %s: %s", job_id, e)
+
+
+async def get_progress_snapshots(job_ids: list[str]) -> list[dict | None]:
+    """Latest published snapshot of each job, None where there is none (or no Redis)."""
+    client = get_redis()
+    if not client or not job_ids:
+        return [None] * len(job_ids)
+    try:
+        values = await client.mget([snapshot_key(job_id) for job_id in job_ids])
+    except RedisError as e:
+        logger.warning("transfer progress: snapshot read failed: %s", e)
+        return [None] * len(job_ids)
+    return [json.loads(value) if value else None for value in values]
+
+
+class ProgressReporter:
+    """Running counts for one transfer, published at most every ``min_interval`` seconds.
+
+    The counts are also saved to the job's ``transfer_jobs`` row, in batches
+    at most every ``TRANSFER_STATUS_INTERVAL`` seconds, for the status endpoints.
+    """
+
+    def __init__(self, job_id: str, total: int, min_interval: float = 0.5, **initial):
+        self.job_id = job_id
+        self.min_interval = min_interval
+        self.save_interval = settings.TRANSFER_STATUS_INTERVAL
+        self.stage = "searching"
+        self.current = None
+        self.counts = {"total": total, "searched": 0, "processed": 0, "matched": 0, "skipped": 0}
+        self.counts.update(initial)
+        self._last_published = 0.0
+        self._last_saved = 0.0
+
+    def set_total(self, total: int):
+        """Set the track count once the source reports it; published with the next update."""
+        self.counts["total"] = total
+
+    def snapshot(self) -> dict:
+        return {"stage": self.stage, "current": self.current, **self.counts}
+
+    async def update(self, stage: str | None = None, current: str | None = None, force: bool = False, **increments):
+        if stage:
+            self.stage = stage
+        if current is not None:
+            self.current = current
+        for name, value in increments.items():
+            self.counts[name] += value
+        now = time.monotonic()
+        if force or stage or now - self._last_published >= self.min_interval:
+            self._last_published = now
+            await publish_progress(self.job_id, self.snapshot())
+        if force or stage or now - self._last_saved >= self.save_interval:
+            self._last_saved = now
+            await update_job(self.job_id, **self.counts)
@@ -0,0 +1,103 @@
+import math
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+
+
+def _percentile(ordered: list[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted, non-empty list."""
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+class TransferTrace:
+    """Where one transfer's time went: busy seconds per span, plus per-call durations.
+
+    Pipeline stages overlap, so span totals may add up to more than the wall
+    time; each says how long that kind of work was in progress. With
+    ``tracks`` set, per-track timings are kept as well for profiling.
+    """
+
+    def __init__(self, tracks: bool = False):
+        self.started = time.perf_counter()
+        self.spans: dict[str, float] = defaultdict(float)
+        self.calls: dict[str, list[float]] = defaultdict(list)
+        self.tracks: dict[int, dict] | None = {} if tracks else None
+
+    @asynccontextmanager
+    async def span(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans[name] += time.perf_counter() - start
+
+    def add(self, name: str, seconds: float):
+        self.spans[name] += seconds
+
+    def add_calls(self, name: str, durations: list[float]):
+        self.spans[name] += sum(durations)
+        self.calls[name].extend(durations)
+
+    async def timed(self, name: str, awaitable, position: int | None = None):
+        """Await ``awaitable``, recording its duration as one ``name`` call; returns its result.
+
+        With ``position``, the duration is also kept as that track's ``<name>_ms``.
+        """
+        start = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            elapsed = time.perf_counter() - start
+            self.add_calls(name, [elapsed])
+            if position is not None:
+                self.track(position, **{f"{name}_ms": round(elapsed * 1000, 1)})
+
+    async def iterate(self, name: str, iterator):
+        """Re-yield an async iterator, counting the time spent waiting for each item under ``name``."""
+        iterator = aiter(iterator)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = await anext(iterator)
+            except StopAsyncIteration:
+                return
+            finally:
+                self.spans[name] += time.perf_counter() - start
+            yield item
+
+    def track(self, position: int, **fields):
+        """Attach ``fields`` to one track's entry; a no-op unless per-track tracing is on."""
+        if self.tracks is not None:
+            self.tracks.setdefault(position, {"position": position}).update(fields)
+
+    def summary(self) -> dict:
+        summary = {
+            "wall_seconds": round(time.perf_counter() - self.started, 3),
+            "spans": {name: round(seconds, 3) for name, seconds in self.spans.items()},
+        }
+        for name, durations in self.calls.items():
+            if not durations:
+                continue
+            ordered = sorted(durations)
+            summary[name] = {
+                "count": len(ordered),
+                "p50_ms": round(_percentile(ordered, 0.5) * 1000, 1),
+                "p95_ms": round(_percentile(ordered, 0.95) * 1000, 1),
+                "max_ms": round(ordered[-1] * 1000, 1),
+            }
+        return summary
+
+    def track_list(self) -> list[dict]:
+        return [self.tracks[position] for position in sorted(self.tracks or {})]
+
+
+def format_summary(summary: dict) -> str:
+    """One log line, e.g. ``wall 12.4s | search 30.2s | ... | search p50 80ms p95 310ms max 2100ms (500)``."""
+    parts = [f"wall {summary['wall_seconds']}s"]
+    parts += [f"{name} {seconds}s" for name, seconds in summary["spans"].items()]
+    parts += [
+        f"{name} p50 {stats['p50_ms']}ms p95 {stats['p95_ms']}ms max {stats['max_ms']}ms ({stats['count']})"
+        for name, stats in summary.items()
+        if isinstance(stats, dict) and "count" in stats
+    ]
+    return " | ".join(parts)
@@ -1,20 +1,129 @@
 import httpx
 
-BASE_URL = "https://www.googleapis.com/youtube/v3"
+from app.core.config import settings
+from app.core.http_client import get_http_client, send_request
+from app.core.metrics import YOUTUBE_QUOTA_UNITS
+from app.services.youtube_parse import parse_duration
+from app.services.youtube_quota import QuotaExhausted, current_window, mark_quota_exhausted, reserve_quota
+
+BASE_URL = settings.YOUTUBE_API_BASE_URL
+
+# HTTP method -> YouTube Data API operation name (e.g. "search.list")
+OPERATIONS = {"GET": "list", "POST": "insert", "PUT": "update", "DELETE": "delete"}
+
+QUOTA_ERROR_REASONS = {"quotaExceeded", "dailyLimitExceeded"}
+# Per-second limits; these 403s are throttling, not a spent budget
+RATE_LIMIT_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+
+
+class YouTubeAPIError(Exception):
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"YouTube API error {status_code}: {message}")
+        self.status_code = status_code
+
+
+def _error_reasons(resp: httpx.Response) -> set[str]:
+    if resp.status_code != 403:
+        return set()
+    try:
+        errors = resp.json()["error"].get("errors", [])
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return set()
+    return {e.get("reason") for e in errors}
+
+
+def _is_quota_error(resp: httpx.Response) -> bool:
+    return bool(_error_reasons(resp) & QUOTA_ERROR_REASONS)
+
+
+def _is_rate_limited(resp: httpx.Response) -> bool:
+    return bool(_error_reasons(resp) & RATE_LIMIT_REASONS)
+
+
+def check_youtube_response(resp: httpx.Response) -> dict:
+    """Return the JSON body, raising YouTubeAPIError if the call failed."""
+    if resp.status_code >= 400:
+        # Gateway errors may come back as HTML rather than a JSON error body
+        try:
+            message = resp.json()["error"]["message"]
+        except (ValueError, KeyError, TypeError):
+            message = resp.text
+        raise YouTubeAPIError(resp.status_code, message)
+    data = resp.json()
+    if "error" in data:
+        raise YouTubeAPIError(resp.status_code, data["error"].get("message", resp.text))
+    return data
+
+
+def get_youtube_client() -> httpx.AsyncClient:
+    return get_http_client("youtube", BASE_URL)
+
+
+async def youtube_request(access_token: str, method: str, resource: str, **kwargs) -> httpx.Response:
+    """Call a YouTube Data API resource through the shared per-process client.
+
+    The call's quota cost is reserved before every attempt, since YouTube
+    charges retried requests too; QuotaExhausted is raised instead of calling
+    YouTube once today's budget is spent.
+    Rate-limit errors are retried with backoff by the shared executor.
+    """
+    headers = {"Authorization": f"Bearer {access_token}", **kwargs.pop("headers", {})}
+    operation = f"{resource}.{OPERATIONS.get(method, method.lower())}"
+
+    async def reserve():
+        YOUTUBE_QUOTA_UNITS.labels(operation).inc(await reserve_quota(operation))
+
+    resp = await send_request(
+        get_youtube_client(),
+        "youtube",
+        operation,
+        method,
+        resource,
+        is_throttled=_is_rate_limited,
+        before_attempt=reserve,
+        headers=headers,
+        **kwargs,
+    )
+    if _is_quota_error(resp):
+        await mark_quota_exhausted()
+        raise QuotaExhausted(current_window()[1])
+    return resp
+
+
+async def get_video_durations(access_token: str, video_ids: list[str]) -> dict[str, int]:
+    """Duration in milliseconds of each video, for up to 50 IDs in one call (1 quota unit)."""
+    resp = await youtube_request(
+        access_token,
+        "GET",
+        "videos",
+        params={
+            "part": "contentDetails",
+            "id": ",".join(video_ids),
+            "maxResults": 50,
+            "fields": "items(id,contentDetails/duration)",
+        },
+    )
+    data = check_youtube_response(resp)
+    durations = {}
+    for item in data.get("items", []):
+        duration = parse_duration(item["contentDetails"]["duration"])
+        if duration:
+            durations[item["id"]] = duration
+    return durations
+
 
 async def search_video(access_token: str, query: str):
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(
-            f"{BASE_URL}/search",
-            params={
-                "part": "snippet",
-                "q": query,
-                "type": "video",
-                "maxResults": 1,
-            },
-            headers={
-                "Authorization": f"Bearer {access_token}"
-            },
-        )
-        data = resp.json()
-        return data["items"][0]["id"]["videoId"]
+    resp = await youtube_request(
+        access_token,
+        "GET",
+        "search",
+        params={
+            "part": "snippet",
+            "q": query,
+            "type": "video",
+            "maxResults": 1,
+            "fields": "items/id/videoId",
+        },
+    )
+    data = check_youtube_response(resp)
+    return data["items"][0]["id"]["videoId"]
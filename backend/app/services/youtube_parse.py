@@ -1,5 +1,7 @@
 import re
 
+_ISO_DURATION = re.compile(r'^P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$')
+
 def parse_title(video_title: str):
     clean_title = re.sub(r'[\(\[][^\]\)]*[\)\]]', '', video_title)
     
@@ -24,3 +26,11 @@ def normalize_title(title):
     title = " ".join(title.lower().split())
     
     return title
+
+def parse_duration(duration: str):
+    """Milliseconds in an ISO 8601 video duration such as "PT3M20S", or None."""
+    match = _ISO_DURATION.match(duration or '')
+    if not match:
+        return None
+    days, hours, minutes, seconds = (int(group or 0) for group in match.groups())
+    return (((days * 24 + hours) * 60 + minutes) * 60 + seconds) * 1000
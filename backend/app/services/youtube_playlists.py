@@ -1,42 +1,48 @@
-import httpx
 from fastapi import HTTPException
 
-BASE = "https://www.googleapis.com/youtube/v3"
+from app.services.youtube import YouTubeAPIError, check_youtube_response, youtube_request
 
-async def get_youtube_playlist_items(access_token: str, playlist_id: str):
-    videos = []
+# Partial response: only the item IDs, titles, video IDs, the total and the paging token are used
+ITEM_FIELDS = "nextPageToken,pageInfo/totalResults,items(id,snippet(title,resourceId/videoId))"
+
+async def iter_youtube_playlist_items(access_token: str, playlist_id: str):
+    """Yield ``(videos, total)`` for each page of a playlist as it arrives.
+
+    Each video is ``{"item_id", "title", "video_id"}``; the playlist item ID
+    tells repeated videos apart.
+    """
     page_token = None
 
-    async with httpx.AsyncClient() as client:
-        while True:
-            r = await client.get(
-                f"{BASE}/playlistItems",
-                params={
-                    "part": "snippet",
-                    "playlistId": playlist_id,
-                    "maxResults": 50,
-                    "pageToken": page_token,
-                },
-                headers={
-                    "Authorization": f"Bearer {access_token}"
-                },
-            )
-
-            data = r.json()
-
-            if "error" in data:
-                #print("YOUTUBE RESPONSE:", data)
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"YouTube API error: {data['error']['message']}",
-                )
-
-            items = data.get("items", [])
-            for item in items:
-                videos.append(item["snippet"]["title"])
-
-            page_token = data.get("nextPageToken")
-            if not page_token:
-                break
-
-    return videos
+    while True:
+        r = await youtube_request(
+            access_token,
+            "GET",
+            "playlistItems",
+            params={
+                "part": "snippet",
+                "playlistId": playlist_id,
+                "maxResults": 50,
+                "pageToken": page_token,
+                "fields": ITEM_FIELDS,
+            },
+        )
+
+        try:
+            data = check_youtube_response(r)
+        except YouTubeAPIError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        items = data.get("items", [])
+        videos = [
+            {
+                "item_id": item.get("id"),
+                "title": item["snippet"]["title"],
+                "video_id": item["snippet"].get("resourceId", {}).get("videoId"),
+            }
+            for item in items
+        ]
+        yield videos, data.get("pageInfo", {}).get("totalResults", len(videos))
+
+        page_token = data.get("nextPageToken")
+        if not page_token:
+            break
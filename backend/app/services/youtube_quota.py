@@ -0,0 +1,115 @@
+import logging
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Units charged per YouTube Data API operation; anything unlisted costs 1
+QUOTA_COSTS = {
+    "search.list": 100,
+    "playlists.insert": 50,
+    "playlists.update": 50,
+    "playlists.delete": 50,
+    "playlistItems.insert": 50,
+    "playlistItems.update": 50,
+    "playlistItems.delete": 50,
+}
+
+# The daily quota resets at midnight Pacific time
+QUOTA_TZ = ZoneInfo("America/Los_Angeles")
+
+# Atomically add ARGV[1] units to the window counter unless that would pass the
+# limit in ARGV[2]. Returns the new total, or -1 when the bucket is empty.
+RESERVE_SCRIPT = """
+local used = tonumber(redis.call('GET', KEYS[1]) or '0')
+local cost = tonumber(ARGV[1])
+if used + cost > tonumber(ARGV[2]) then
+    return -1
+end
+redis.call('INCRBY', KEYS[1], cost)
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return used + cost
+"""
+
+# Fallback ledger when no Redis is configured (per process only)
+_local_usage: dict[str, int] = {}
+
+
+class QuotaExhausted(Exception):
+    def __init__(self, retry_after: int):
+        super().__init__(f"YouTube quota exhausted; resets in {retry_after}s")
+        self.retry_after = retry_after
+
+
+def quota_cost(operation: str) -> int:
+    return QUOTA_COSTS.get(operation, 1)
+
+
+def current_window() -> tuple[str, int]:
+    """Return the current quota day and the seconds until it resets."""
+    now = datetime.now(QUOTA_TZ)
+    reset = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return now.date().isoformat(), int((reset - now).total_seconds()) + 1
+
+
+def _ledger_key(window: str) -> str:
+    return f"youtube_quota:{window}"
+
+
+async def reserve_quota(operation: str) -> int:
+    """Charge ``operation`` against today's shared budget, or raise QuotaExhausted."""
+    cost = quota_cost(operation)
+    window, retry_after = current_window()
+    limit = settings.YOUTUBE_DAILY_QUOTA
+
+    client = get_redis()
+    if client:
+        try:
+            used = await client.eval(
+                RESERVE_SCRIPT, 1, _ledger_key(window), cost, limit, retry_after + 3600
+            )
+        except RedisError as e:
+            logger.warning("youtube quota: redis unavailable, using local ledger: %s", e)
+        else:
+            if used < 0:
+                raise QuotaExhausted(retry_after)
+            return cost
+
+    if window not in _local_usage:
+        # New day: drop previous windows
+        _local_usage.clear()
+    used = _local_usage.get(window, 0)
+    if used + cost > limit:
+        raise QuotaExhausted(retry_after)
+    _local_usage[window] = used + cost
+    return cost
+
+
+async def remaining_quota() -> int:
+    window, _ = current_window()
+    client = get_redis()
+    if client:
+        try:
+            used = int(await client.get(_ledger_key(window)) or 0)
+            return max(0, settings.YOUTUBE_DAILY_QUOTA - used)
+        except RedisError:
+            pass
+    return max(0, settings.YOUTUBE_DAILY_QUOTA - _local_usage.get(window, 0))
+
+
+async def mark_quota_exhausted():
+    """Close today's budget for every worker after YouTube reports quotaExceeded."""
+    window, retry_after = current_window()
+    client = get_redis()
+    if client:
+        try:
+            await client.set(_ledger_key(window), settings.YOUTUBE_DAILY_QUOTA, ex=retry_after + 3600)
+            return
+        except RedisError:
+            pass
+    _local_usage[window] = settings.YOUTUBE_DAILY_QUOTA
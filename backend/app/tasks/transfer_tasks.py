@@ -1,209 +1,730 @@
 import asyncio
+import logging
+import time
+import uuid
+
+import httpx
 from celery import shared_task
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-import spotipy
-import httpx
 
 from app.core.celery_app import celery_app
+from app.core.config import settings
 from app.core.database import AsyncSessionLocal
-from app.models.oauth_account import OAuthAccount
-from app.services.oauth_utils import ensure_token_valid
-from app.services.youtube_playlists import get_youtube_playlist_items
-from app.services.youtube_parse import parse_title, normalize_title
+from app.core.metrics import TRANSFERS, record_transfer, timed_step
+from app.core.worker_loop import run_async
+from app.services.match_cache import (
+    SPOTIFY_TO_YOUTUBE,
+    YOUTUBE_TO_SPOTIFY,
+    cached_search,
+    isrc_key,
+    query_key,
+    store_match,
+    video_key,
+)
+from app.services.matching import DURATION_CONFIDENT_MS, best_match, prepare_track
+from app.services.oauth_utils import get_access_tokens
+from app.services.playlist_cache import invalidate_playlists
+from app.services.playlist_sync import SyncState, load_sync, record_sync
+from app.services.spotify import (
+    PlaylistWriter,
+    create_playlist,
+    get_playlist_snapshot,
+    iter_pages,
+    search_tracks,
+)
+from app.services.transfer_checkpoint import TransferCheckpoint
+from app.services.transfer_jobs import update_job
+from app.services.transfer_progress import ProgressReporter, publish_progress
+from app.services.transfer_trace import TransferTrace, format_summary
+from app.services.youtube_playlists import iter_youtube_playlist_items
+from app.services.youtube import check_youtube_response, get_video_durations, youtube_request
+from app.services.youtube_parse import parse_title
+from app.services.youtube_quota import QuotaExhausted, current_window, quota_cost, remaining_quota
 
-YOUTUBE_BASE = "https://www.googleapis.com/youtube/v3"
+logger = logging.getLogger(__name__)
 
-async def get_spotify_tracks(access_token: str, playlist_id: str):
-    sp = spotipy.Spotify(auth=access_token)
-    tracks = []
-    results = sp.playlist_items(playlist_id, limit=100)
-    while results:
-        for item in results["items"]:
+# Smallest budget worth starting a Spotify -> YouTube transfer with
+MIN_TRANSFER_QUOTA = quota_cost("playlists.insert") + quota_cost("search.list") + quota_cost("playlistItems.insert")
+
+# Partial responses: search results are scored on title and channel only,
+# and inserts only need the new resource's ID back
+SEARCH_FIELDS = "items(id/videoId,snippet(title,channelTitle))"
+INSERT_FIELDS = "id"
+
+async def match_in_order(items, matcher, concurrency: int, window: int | None = None):
+    """Yield ``(item, result)`` for ``items`` in order, running ``matcher`` concurrently.
+
+    ``items`` may be a list or an async iterable such as a fetch stage. At most
+    ``concurrency`` calls are in flight and at most ``window`` items (default
+    four times ``concurrency``) are taken ahead of the consumer, so a slow
+    consumer pauses matching and, through it, fetching. A failed call yields
+    its exception as the result; an error raised by ``items`` is re-raised.
+    """
+    concurrency = max(1, concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=window or 4 * concurrency)
+    end = object()
+
+    async def run(item):
+        async with semaphore:
+            try:
+                return await matcher(item)
+            except Exception as e:
+                return e
+
+    async def put(item):
+        task = asyncio.create_task(run(item))
+        try:
+            await queue.put((item, task))
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+
+    async def feed():
+        try:
+            if hasattr(items, "__aiter__"):
+                async for item in items:
+                    await put(item)
+            else:
+                for item in items:
+                    await put(item)
+        except Exception as e:
+            await queue.put((end, e))
+        else:
+            await queue.put((end, None))
+
+    feeder = asyncio.create_task(feed())
+    try:
+        while True:
+            item, task = await queue.get()
+            if item is end:
+                if task is not None:
+                    raise task
+                return
+            yield item, await task
+    finally:
+        feeder.cancel()
+        while not queue.empty():
+            _, task = queue.get_nowait()
+            if isinstance(task, asyncio.Task):
+                task.cancel()
+
+async def iter_spotify_tracks(access_token: str, playlist_id: str):
+    """Yield ``(tracks, total)`` for each page of a playlist as it arrives."""
+    async for items, total in iter_pages(
+        access_token,
+        f"playlists/{playlist_id}/items",
+        endpoint="playlists/items",
+        limit=100,
+        params={"additional_types": "track,episode"},
+    ):
+        tracks = []
+        for item in items:
             track = item.get("track") or item.get("item")
             if not track:
                 continue
             tracks.append({
+                "id": track.get("id"),
                 "name": track["name"],
                 "artist": track["artists"][0]["name"],
+                "isrc": track.get("external_ids", {}).get("isrc"),
+                "duration_ms": track.get("duration_ms"),
+                "album": (track.get("album") or {}).get("name"),
             })
-        results = sp.next(results) if results["next"] else None
-    return tracks
-
-async def youtube_search(access_token: str, title: str, artist: str):
-    queries = [f"{title} {artist}"]
-    async with httpx.AsyncClient() as client:
-        for q in queries:
-            r = await client.get(
-                f"{YOUTUBE_BASE}/search",
-                params={"part": "snippet", "q": q, "type": "video", "maxResults": 5},
-                headers={"Authorization": f"Bearer {access_token}"},
-            )
-            data = r.json()
-            items = data.get("items", [])
-            if not items:
-                continue
-            best_id = None
-            best_ratio = 0.0
-            target_str = f"{title} {artist}".lower()
-            for item in items:
-                yt_title = item["snippet"]["title"].lower()
-                target_words = set(target_str.split())
-                yt_words = set(yt_title.split())
-                if not target_words:
-                    continue
-                overlap = len(target_words.intersection(yt_words)) / len(target_words)
-                if overlap > best_ratio:
-                    best_ratio = overlap
-                    best_id = item["id"]["videoId"]
-            if best_ratio > 0.5:
-                return best_id
-            elif items:
-                return items[0]["id"]["videoId"]
-    return None
+        yield tracks, total
+
+def once_per_key():
+    """Return ``run(key, call)``, which awaits ``call()`` only once per ``key``.
+
+    Playlists often repeat a track: within one transfer the repeats share the
+    first occurrence's search instead of searching, or reading the match
+    cache, again.
+    """
+    calls: dict[str, asyncio.Task] = {}
+
+    async def run(key: str, call):
+        if key not in calls:
+            calls[key] = asyncio.ensure_future(call())
+        return await asyncio.shield(calls[key])
+
+    return run
+
+@timed_step("youtube_search")
+async def youtube_search(access_token: str, track: dict):
+    keys = [
+        f"spotify:{track['id']}" if track.get("id") else None,
+        # The same recording often has several Spotify IDs (single, album, compilation)
+        isrc_key(track["isrc"]) if track.get("isrc") else None,
+        query_key(track["name"], track["artist"]),
+    ]
+
+    async def search():
+        video_id, confident = await _youtube_search_api(access_token, track)
+        if confident and track.get("isrc"):
+            # Lets a later YouTube -> Spotify transfer look this video up by ISRC
+            await store_match(YOUTUBE_TO_SPOTIFY, [video_key(video_id)], isrc_key(track["isrc"]))
+        return video_id
+
+    return await cached_search(SPOTIFY_TO_YOUTUBE, keys, search)
+
+async def _youtube_search_api(access_token: str, track: dict) -> tuple[str | None, bool]:
+    """Return ``(video_id, confident)``; a guessed top result is not confident."""
+    title, artist = track["name"], track["artist"]
+    r = await youtube_request(
+        access_token,
+        "GET",
+        "search",
+        params={"part": "snippet", "q": f"{title} {artist}", "type": "video", "maxResults": 5, "fields": SEARCH_FIELDS},
+    )
+    items = check_youtube_response(r).get("items", [])
+    if not items:
+        return None, False
+    video_ids = [item["id"]["videoId"] for item in items]
+    candidates = [
+        {"title": item["snippet"]["title"], "artist": item["snippet"].get("channelTitle", "")}
+        for item in items
+    ]
+    index, _ = best_match(prepare_track(title, artist), candidates)
+    if index is not None:
+        return video_ids[index], True
+
+    # The titles alone are inconclusive; durations settle most of these for one quota unit
+    if track.get("duration_ms"):
+        durations = await get_video_durations(access_token, video_ids)
+        for candidate, video_id in zip(candidates, video_ids):
+            candidate["duration_ms"] = durations.get(video_id)
+        top = candidates[0]["duration_ms"]
+        if top and abs(top - track["duration_ms"]) <= DURATION_CONFIDENT_MS:
+            return video_ids[0], True
+        index, _ = best_match(prepare_track(title, artist, track["duration_ms"]), candidates)
+        if index is not None:
+            return video_ids[index], True
+
+    # Fall back to YouTube's own top result when nothing scores well
+    return video_ids[0], False
 
 async def create_youtube_playlist(access_token: str, title: str):
-    async with httpx.AsyncClient() as client:
-        r = await client.post(
-            f"{YOUTUBE_BASE}/playlists",
-            params={"part": "snippet,status"},
-            json={"snippet": {"title": title}, "status": {"privacyStatus": "private"}},
-            headers={"Authorization": f"Bearer {access_token}"},
-        )
-        return r.json()["id"]
+    r = await youtube_request(
+        access_token,
+        "POST",
+        "playlists",
+        params={"part": "snippet,status", "fields": INSERT_FIELDS},
+        json={"snippet": {"title": title}, "status": {"privacyStatus": "private"}},
+    )
+    return check_youtube_response(r)["id"]
 
+@timed_step("add_video_to_playlist")
 async def add_video_to_playlist(access_token: str, playlist_id: str, video_id: str):
-    async with httpx.AsyncClient() as client:
-        await client.post(
-            f"{YOUTUBE_BASE}/playlistItems",
-            params={"part": "snippet"},
-            json={"snippet": {"playlistId": playlist_id, "resourceId": {"kind": "youtube#video", "videoId": video_id}}},
-            headers={"Authorization": f"Bearer {access_token}"},
+    r = await youtube_request(
+        access_token,
+        "POST",
+        "playlistItems",
+        params={"part": "snippet", "fields": INSERT_FIELDS},
+        json={"snippet": {"playlistId": playlist_id, "resourceId": {"kind": "youtube#video", "videoId": video_id}}},
+    )
+    check_youtube_response(r)
+
+async def _transfer_spotify_to_youtube_async(
+    user_id: int,
+    playlist_id: str,
+    target_title: str,
+    job_id: str | None = None,
+    sync: bool = False,
+):
+    job_id = job_id or uuid.uuid4().hex
+    trace = TransferTrace(tracks=settings.TRANSFER_TRACE_TRACKS)
+    async with trace.span("tokens"):
+        # Only the token lookup uses this session; closing it here keeps the
+        # transfer from holding a pooled connection for its whole run
+        async with AsyncSessionLocal() as db:
+            tokens = await get_access_tokens(db, user_id, ["spotify", "youtube"])
+    spotify_token, youtube_token = tokens["spotify"], tokens["youtube"]
+    if not spotify_token or not youtube_token:
+        return {"error": "Missing connected accounts"}
+
+    # Read before the items, so edits made while they are fetched show up
+    # as a new snapshot on the next sync
+    async with trace.span("fetch"):
+        snapshot_id = await get_playlist_snapshot(spotify_token, playlist_id)
+    async with trace.span("db"):
+        synced = await load_sync(user_id, SPOTIFY_TO_YOUTUBE, playlist_id) if sync else SyncState()
+    if synced.unchanged(snapshot_id):
+        result = {
+            **sync_counts(synced.tracks.values(), 0, 0),
+            "youtube_playlist_id": synced.destination_playlist_id,
+            "errors": [],
+        }
+        result["sync"]["unchanged"] = True
+        finish_trace(job_id, trace, None, result)
+        return result
+
+    async with trace.span("db"):
+        checkpoint = await TransferCheckpoint.load(job_id, user_id, SPOTIFY_TO_YOUTUBE, playlist_id)
+    progress = ProgressReporter(job_id, 0)
+    await progress.update(stage="transferring")
+
+    # Admission: defer to the next quota window rather than start a transfer
+    # that cannot make progress; otherwise run until the budget runs out.
+    remaining = await remaining_quota()
+    if remaining < MIN_TRANSFER_QUOTA:
+        raise QuotaExhausted(current_window()[1])
+
+    yt_playlist_id = checkpoint.destination_playlist_id or synced.destination_playlist_id
+    if not yt_playlist_id:
+        async with trace.span("create_playlist"):
+            yt_playlist_id = await create_youtube_playlist(youtube_token, target_title)
+        await checkpoint.set_destination(yt_playlist_id)
+        await invalidate_playlists("youtube", user_id)
+    elif not checkpoint.destination_playlist_id:
+        await checkpoint.set_destination(yt_playlist_id)
+
+    tracks = []
+    # Targets of the tracks an earlier transfer already settled, in playlist order
+    already = []
+
+    async def pending_tracks():
+        # Fetch stage: source pages feed matching as soon as they arrive
+        async for page, total in trace.iterate("fetch", iter_spotify_tracks(spotify_token, playlist_id)):
+            if not tracks:
+                progress.set_total(total)
+                estimated = total * (quota_cost("search.list") + quota_cost("playlistItems.insert"))
+                if remaining < estimated:
+                    logger.info(
+                        "Transfer for user %s admitted partially: %s quota units left, up to %s needed",
+                        user_id, remaining, estimated,
+                    )
+            for t in page:
+                key = t["id"] or f"{t['name']} - {t['artist']}"
+                if key in synced.tracks:
+                    already.append(synced.tracks[key])
+                    await report_synced(progress, already[-1])
+                    continue
+                tracks.append(t)
+                item = checkpoint.add(key)
+                if item.inserted:
+                    await progress.update(searched=1, processed=1, matched=1)
+                else:
+                    yield item
+
+    search_once = once_per_key()
+
+    async def match(item):
+        if item.resolved:
+            return item.target_id
+        t = tracks[item.position]
+        video_id = await trace.timed(
+            "search",
+            search_once(item.source_item, lambda: youtube_search(youtube_token, t)),
+            item.position,
         )
+        trace.track(item.position, source=item.source_item, target=video_id)
+        await checkpoint.resolve(item.position, video_id)
+        await progress.update(current=f"{t['name']} - {t['artist']}", searched=1)
+        return video_id
 
-async def _transfer_spotify_to_youtube_async(user_id: int, playlist_id: str, target_title: str):
-    async with AsyncSessionLocal() as db:
-        spotify = await db.execute(select(OAuthAccount).where(OAuthAccount.user_id == user_id, OAuthAccount.provider == "spotify"))
-        youtube = await db.execute(select(OAuthAccount).where(OAuthAccount.user_id == user_id, OAuthAccount.provider == "youtube"))
-        
-        spotify_acc = spotify.scalar_one_or_none()
-        youtube_acc = youtube.scalar_one_or_none()
-        if not spotify_acc or not youtube_acc:
-            return {"error": "Missing connected accounts"}
-
-        spotify_acc = await ensure_token_valid(db, spotify_acc)
-        youtube_acc = await ensure_token_valid(db, youtube_acc)
-
-        tracks = await get_spotify_tracks(spotify_acc.access_token, playlist_id)
-        yt_playlist_id = await create_youtube_playlist(youtube_acc.access_token, target_title)
-
-        matched, skipped = 0, 0
-        errors = []
-        for t in tracks:
-            video_id = await youtube_search(youtube_acc.access_token, t["name"], t["artist"])
-            if not video_id:
-                skipped += 1
-                continue
+    # Write stage: insert matches in playlist order while later pages are
+    # still being fetched and searched
+    started = time.perf_counter()
+    first_insert_seconds = None
+    errors = []
+    quota_exhausted = False
+    processed = 0
+    async for item, video_id in match_in_order(pending_tracks(), match, settings.SEARCH_CONCURRENCY):
+        processed += 1
+        t = tracks[item.position]
+        current = f"{t['name']} - {t['artist']}"
+        if isinstance(video_id, QuotaExhausted):
+            quota_exhausted = True
+        elif isinstance(video_id, Exception):
+            errors.append(str(video_id))
+        elif video_id:
             try:
-                await add_video_to_playlist(youtube_acc.access_token, yt_playlist_id, video_id)
-                matched += 1
+                await trace.timed("insert", add_video_to_playlist(youtube_token, yt_playlist_id, video_id), item.position)
+            except QuotaExhausted:
+                quota_exhausted = True
             except Exception as e:
-                skipped += 1
                 errors.append(str(e))
-        return {
-            "total": len(tracks),
-            "matched": matched,
-            "skipped": skipped,
-            "youtube_playlist_id": yt_playlist_id,
-            "errors": errors[:5],
-        }
+            else:
+                await checkpoint.mark_inserted([item.position])
+                await progress.update(current=current, processed=1, matched=1)
+                if first_insert_seconds is None:
+                    first_insert_seconds = time.perf_counter() - started
+                continue
+        await progress.update(current=current, processed=1, skipped=1)
+    match_seconds = time.perf_counter() - started
+    await checkpoint.flush()
+    # Final counts for the job's row, which is otherwise saved only every few seconds
+    await progress.update(force=True)
 
-@celery_app.task(bind=True)
-def transfer_spotify_to_youtube_task(self, user_id: int, playlist_id: str, target_title: str):
-    loop = asyncio.get_event_loop()
-    if loop.is_closed():
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-    return loop.run_until_complete(_transfer_spotify_to_youtube_async(user_id, playlist_id, target_title))
+    settled = settled_tracks(checkpoint, lambda item: item.source_item)
+    await record_sync(
+        user_id,
+        SPOTIFY_TO_YOUTUBE,
+        playlist_id,
+        yt_playlist_id,
+        settled,
+        # A snapshot with unsettled tracks must not let the next sync skip them
+        snapshot_id if len(settled) == len(checkpoint.items) else None,
+    )
+
+    result = {
+        **sync_counts(already, len(tracks), checkpoint.inserted_count()),
+        "youtube_playlist_id": yt_playlist_id,
+        "resumed": checkpoint.resumed,
+        "errors": errors[:5],
+        "quota_exhausted": quota_exhausted,
+        "match_seconds": round(match_seconds, 2),
+        "first_insert_seconds": round(first_insert_seconds, 2) if first_insert_seconds is not None else None,
+        "tracks_per_second": round(processed / match_seconds, 2) if match_seconds else None,
+    }
+    finish_trace(job_id, trace, checkpoint, result)
+    record_transfer(SPOTIFY_TO_YOUTUBE, result)
+    return result
+
+async def report_synced(progress: ProgressReporter, target_id: str | None):
+    """Count a track an earlier transfer to the same destination already settled."""
+    if target_id:
+        await progress.update(searched=1, processed=1, matched=1)
+    else:
+        await progress.update(searched=1, processed=1, skipped=1)
+
+def settled_tracks(checkpoint: TransferCheckpoint, key) -> dict[str, str | None]:
+    """Source key -> target of every item that needs no further work: inserted, or searched without a match."""
+    return {
+        key(item): item.target_id if item.inserted else None
+        for item in checkpoint.items
+        if item.inserted or (item.resolved and not item.target_id)
+    }
+
+def sync_counts(already, handled: int, inserted: int) -> dict:
+    """Totals over the whole playlist, with the share earlier transfers settled under ``sync``.
+
+    ``already`` holds the stored targets of the tracks this run skipped;
+    ``handled`` tracks went through this run, ``inserted`` of them were written.
+    """
+    already = list(already)
+    already_matched = sum(1 for target in already if target)
+    total = len(already) + handled
+    matched = already_matched + inserted
+    return {
+        "total": total,
+        "matched": matched,
+        "skipped": total - matched,
+        "sync": {
+            "unchanged": False,
+            "already_matched": already_matched,
+            "already_skipped": len(already) - already_matched,
+            "added": inserted,
+        },
+    }
+
+def finish_trace(job_id: str, trace: TransferTrace, checkpoint: TransferCheckpoint | None, result: dict):
+    """Add the timing summary (and per-track trace, if enabled) to ``result`` and log it."""
+    if checkpoint:
+        trace.add("db", checkpoint.db_seconds)
+    result["timings"] = trace.summary()
+    if trace.tracks is not None:
+        result["trace"] = trace.track_list()
+    logger.info("Transfer %s timings: %s", job_id, format_summary(result["timings"]))
+
+TASK_OPTIONS = {
+    "bind": True,
+    # Redeliver a transfer if its worker dies; the retry resumes from its checkpoint
+    "acks_late": True,
+    "reject_on_worker_lost": True,
+    "autoretry_for": (httpx.TransportError,),
+    "retry_backoff": True,
+    "max_retries": 5,
+}
+
+async def _run_with_progress(
+    transfer,
+    user_id: int,
+    playlist_id: str,
+    target_title: str,
+    job_id: str,
+    sync: bool,
+    will_retry=lambda e: False,
+):
+    """Run ``transfer`` and record its final state for live progress subscribers and the job's row.
+
+    An error that ``will_retry`` says Celery retries is reported as the
+    non-final ``retrying`` stage, so watchers keep following the job.
+    """
+    try:
+        result = await transfer(user_id, playlist_id, target_title, job_id, sync)
+    except QuotaExhausted as e:
+        TRANSFERS.labels("deferred").inc()
+        await publish_progress(job_id, {"stage": "deferred", "retry_after": e.retry_after})
+        await update_job(job_id, state="deferred")
+        raise
+    except Exception as e:
+        if will_retry(e):
+            TRANSFERS.labels("retrying").inc()
+            await publish_progress(job_id, {"stage": "retrying", "error": str(e)})
+            await update_job(job_id, state="retrying", error=str(e))
+            raise
+        TRANSFERS.labels("failed").inc()
+        await publish_progress(job_id, {"stage": "failed", "error": str(e)})
+        await update_job(job_id, state="failed", error=str(e), finished_at=int(time.time()))
+        raise
+    TRANSFERS.labels("done").inc()
+    await publish_progress(job_id, {"stage": "done", "result": result})
+    await update_job(job_id, **finished_job(result))
+    return result
+
+def finished_job(result: dict) -> dict:
+    """``transfer_jobs`` values for a transfer that returned ``result``."""
+    values = {
+        "state": "failed" if result.get("error") else "done",
+        "error": result.get("error"),
+        "result": result,
+        "finished_at": int(time.time()),
+    }
+    if "total" in result:
+        values.update(
+            total=result["total"],
+            processed=result["matched"] + result["skipped"],
+            matched=result["matched"],
+            skipped=result["skipped"],
+        )
+    destination = result.get("youtube_playlist_id") or result.get("spotify_playlist_id")
+    if destination:
+        values["destination_playlist_id"] = destination
+    return values
+
+def will_autoretry(task, exc: Exception) -> bool:
+    """Whether Celery's ``autoretry_for`` will run ``task`` again after ``exc``."""
+    return isinstance(exc, TASK_OPTIONS["autoretry_for"]) and task.request.retries < task.max_retries
+
+def run_transfer_task(task, transfer, user_id: int, playlist_id: str, target_title: str, sync: bool = False):
+    try:
+        # Runs on the process-wide loop, alongside other transfers in this worker
+        return run_async(_run_with_progress(
+            transfer,
+            user_id,
+            playlist_id,
+            target_title,
+            task.request.id,
+            sync,
+            will_retry=lambda e: will_autoretry(task, e),
+        ))
+    except QuotaExhausted as e:
+        # Resume from the checkpoint once the quota window resets
+        raise task.retry(exc=e, countdown=e.retry_after)
+
+@celery_app.task(**TASK_OPTIONS)
+def transfer_spotify_to_youtube_task(self, user_id: int, playlist_id: str, target_title: str, sync: bool = False):
+    """Copy a Spotify playlist to YouTube; with ``sync``, only add what an earlier transfer has not."""
+    return run_transfer_task(self, _transfer_spotify_to_youtube_async, user_id, playlist_id, target_title, sync)
 
 # --- YouTube to Spotify logic ---
 
-def spotify_search(sp: spotipy.Spotify, track: str, artist: str):
+@timed_step("spotify_search")
+async def spotify_search(access_token: str, track: str, artist: str, video_id: str | None = None):
+    keys = [video_key(video_id) if video_id else None, query_key(track, artist)]
+    target = await cached_search(
+        YOUTUBE_TO_SPOTIFY,
+        keys,
+        lambda: _spotify_search_api(access_token, track, artist),
+    )
+    if target and target.startswith("isrc:"):
+        # A video matched from a Spotify track before: look the recording up exactly
+        items = await search_tracks(access_token, target, limit=1)
+        return items[0]["uri"] if items else await _spotify_search_api(access_token, track, artist)
+    return target
+
+async def _spotify_search_api(access_token: str, track: str, artist: str):
     q = f"{track} {artist}"
-    res = sp.search(q=q, type="track", limit=10)
-    items = res["tracks"]["items"]
-    best_uri = None
-    best_ratio = 0.0
-    for item in items:
-        normal_title = normalize_title(item["name"])
-        normal_track = normalize_title(track)
-        if normal_title == normal_track:
-            return item["uri"]
-        target_words = set(normal_track.split())
-        title_words = set(normal_title.split())
-        if not target_words:
-            continue
-        ratio = len(target_words.intersection(title_words)) / len(target_words)
-        if ratio > best_ratio:
-            best_ratio = ratio
-            best_uri = item["uri"]
-    if best_ratio > 0.5:
-        return best_uri
-    return None
-
-def create_spotify_playlist(access_token: str, user_id: str, name: str):
-    sp = spotipy.Spotify(auth=access_token)
-    data = {"name": name, "public": False, "collaborative": False, "description": ""}
-    playlist = sp._post("me/playlists", payload=data)
-    return playlist["id"]
-
-async def _transfer_youtube_to_spotify_async(user_id: int, playlist_id: str, target_title: str):
-    async with AsyncSessionLocal() as db:
-        yt = await db.execute(select(OAuthAccount).where(OAuthAccount.user_id == user_id, OAuthAccount.provider == "youtube"))
-        sp_acc = await db.execute(select(OAuthAccount).where(OAuthAccount.user_id == user_id, OAuthAccount.provider == "spotify"))
-        
-        yt_acc = yt.scalar_one_or_none()
-        spotify_acc = sp_acc.scalar_one_or_none()
-        if not yt_acc or not spotify_acc:
-            return {"error": "Missing connected accounts"}
-
-        yt_acc = await ensure_token_valid(db, yt_acc)
-        spotify_acc = await ensure_token_valid(db, spotify_acc)
-
-        titles = await get_youtube_playlist_items(yt_acc.access_token, playlist_id)
-        sp = spotipy.Spotify(auth=spotify_acc.access_token)
-        me = sp.me()
-        
-        playlist_id_sp = create_spotify_playlist(spotify_acc.access_token, me["id"], target_title)
-
-        matched, skipped = 0, 0
-        uris = []
-        for title in titles:
-            metadata = parse_title(title)
-            artist = metadata["artist"]
-            track = metadata["track"]
-            if not track:
-                skipped += 1
-                continue
-            uri = spotify_search(sp, track, artist)
-            if uri:
-                uris.append(uri)
-                matched += 1
-            else:
-                skipped += 1
-        if uris:
-            sp.playlist_add_items(playlist_id_sp, uris)
-        return {
-            "total": len(titles),
-            "matched": matched,
-            "skipped": skipped,
-            "spotify_playlist_id": playlist_id_sp,
+    items = await search_tracks(access_token, q, limit=10)
+    candidates = [
+        {
+            "title": item["name"],
+            "artist": " ".join(a["name"] for a in item.get("artists", [])),
+            "duration_ms": item.get("duration_ms"),
         }
+        for item in items
+    ]
+    index, _ = best_match(
+        prepare_track(track, artist, include_artist=False),
+        candidates,
+        exact_title_wins=True,
+    )
+    return items[index]["uri"] if index is not None else None
+
+async def create_spotify_playlist(access_token: str, name: str):
+    return await create_playlist(access_token, name, public=False)
+
+async def _transfer_youtube_to_spotify_async(
+    user_id: int,
+    playlist_id: str,
+    target_title: str,
+    job_id: str | None = None,
+    sync: bool = False,
+):
+    job_id = job_id or uuid.uuid4().hex
+    trace = TransferTrace(tracks=settings.TRANSFER_TRACE_TRACKS)
+    async with trace.span("tokens"):
+        # Only the token lookup uses this session; closing it here keeps the
+        # transfer from holding a pooled connection for its whole run
+        async with AsyncSessionLocal() as db:
+            tokens = await get_access_tokens(db, user_id, ["youtube", "spotify"])
+    youtube_token, spotify_token = tokens["youtube"], tokens["spotify"]
+    if not youtube_token or not spotify_token:
+        return {"error": "Missing connected accounts"}
+
+    # YouTube playlists have no snapshot ID: a sync always lists the items
+    # and diffs their playlist item IDs
+    async with trace.span("db"):
+        synced = await load_sync(user_id, YOUTUBE_TO_SPOTIFY, playlist_id) if sync else SyncState()
+        checkpoint = await TransferCheckpoint.load(job_id, user_id, YOUTUBE_TO_SPOTIFY, playlist_id)
+    progress = ProgressReporter(job_id, 0)
+    await progress.update(stage="transferring")
+
+    playlist_id_sp = checkpoint.destination_playlist_id or synced.destination_playlist_id
+    if not playlist_id_sp:
+        async with trace.span("create_playlist"):
+            playlist_id_sp = await create_spotify_playlist(spotify_token, target_title)
+        await checkpoint.set_destination(playlist_id_sp)
+        await invalidate_playlists("spotify", user_id)
+    elif not checkpoint.destination_playlist_id:
+        await checkpoint.set_destination(playlist_id_sp)
+
+    videos = []
+    already = []
+
+    def sync_key(video: dict) -> str:
+        return video["item_id"] or video["title"]
+
+    async def pending_videos():
+        # Fetch stage: source pages feed parsing and matching as soon as they arrive
+        async for page, total in trace.iterate("fetch", iter_youtube_playlist_items(youtube_token, playlist_id)):
+            if not videos:
+                progress.set_total(total)
+            for video in page:
+                if sync_key(video) in synced.tracks:
+                    already.append(synced.tracks[sync_key(video)])
+                    await report_synced(progress, already[-1])
+                    continue
+                videos.append(video)
+                item = checkpoint.add(video["title"])
+                if item.inserted:
+                    await progress.update(searched=1, processed=1, matched=1)
+                else:
+                    yield item
+
+    search_once = once_per_key()
+
+    async def match(item):
+        if item.resolved:
+            return item.target_id
+        video = videos[item.position]
+        title = video["title"]
+        metadata = parse_title(title)
+        uri = None
+        try:
+            if metadata["track"]:
+                uri = await trace.timed(
+                    "search",
+                    search_once(
+                        item.source_item,
+                        lambda: spotify_search(spotify_token, metadata["track"], metadata["artist"], video["video_id"]),
+                    ),
+                    item.position,
+                )
+        except Exception:
+            await progress.update(current=title, searched=1, processed=1, skipped=1)
+            raise
+        trace.track(item.position, source=title, target=uri)
+        await checkpoint.resolve(item.position, uri)
+        if uri:
+            await progress.update(current=title, searched=1)
+        else:
+            await progress.update(current=title, searched=1, processed=1, skipped=1)
+        return uri
+
+    started = time.perf_counter()
+    first_insert_seconds = None
+
+    async def written(positions):
+        nonlocal first_insert_seconds
+        if first_insert_seconds is None:
+            first_insert_seconds = time.perf_counter() - started
+        await checkpoint.mark_inserted(positions)
+        await progress.update(processed=len(positions), matched=len(positions))
+
+    # Write stage: matches are written in 100-track chunks while later pages
+    # are still being fetched and searched; a full writer queue pauses both
+    writer = PlaylistWriter(spotify_token, playlist_id_sp, on_written=written)
+
+    errors = []
+    processed = 0
+    try:
+        async for item, uri in match_in_order(pending_videos(), match, settings.SEARCH_CONCURRENCY):
+            processed += 1
+            if isinstance(uri, Exception):
+                errors.append(str(uri))
+            elif uri:
+                await writer.add(uri, item.position)
+        await writer.close()
+        match_seconds = time.perf_counter() - started
+    finally:
+        # If fetching failed the job is about to be retried or deferred: stop
+        # the writer so no queued chunk is written behind the retry, and save
+        # the checkpoint the retry resumes from
+        await writer.abort()
+        await checkpoint.flush()
+    # Final counts for the job's row, which is otherwise saved only every few seconds
+    await progress.update(force=True)
+
+    errors.extend(writer.errors)
+    trace.add_calls("insert", writer.write_seconds)
+    await record_sync(
+        user_id,
+        YOUTUBE_TO_SPOTIFY,
+        playlist_id,
+        playlist_id_sp,
+        settled_tracks(checkpoint, lambda item: sync_key(videos[item.position])),
+    )
+
+    result = {
+        **sync_counts(already, len(videos), checkpoint.inserted_count()),
+        "spotify_playlist_id": playlist_id_sp,
+        "snapshot_id": writer.snapshot_id,
+        "resumed": checkpoint.resumed,
+        "errors": errors[:5],
+        "match_seconds": round(match_seconds, 2),
+        "first_insert_seconds": round(first_insert_seconds, 2) if first_insert_seconds is not None else None,
+        "tracks_per_second": round(processed / match_seconds, 2) if match_seconds else None,
+    }
+    finish_trace(job_id, trace, checkpoint, result)
+    record_transfer(YOUTUBE_TO_SPOTIFY, result)
+    return result
+
+@celery_app.task(**TASK_OPTIONS)
+def transfer_youtube_to_spotify_task(self, user_id: int, playlist_id: str, target_title: str, sync: bool = False):
+    """Copy a YouTube playlist to Spotify; with ``sync``, only add what an earlier transfer has not."""
+    return run_transfer_task(self, _transfer_youtube_to_spotify_async, user_id, playlist_id, target_title, sync)
+
+TRANSFER_TASKS = {
+    SPOTIFY_TO_YOUTUBE: transfer_spotify_to_youtube_task,
+    YOUTUBE_TO_SPOTIFY: transfer_youtube_to_spotify_task,
+}
+
+def summarize_batch(results: list[dict]) -> dict:
+    """Sum per-playlist transfer results into one batch result."""
+    return {
+        "playlists": len(results),
+        "total": sum(r.get("total", 0) for r in results),
+        "matched": sum(r.get("matched", 0) for r in results),
+        "skipped": sum(r.get("skipped", 0) for r in results),
+        "errors": [r["error"] for r in results if r.get("error")][:5],
+        "results": results,
+    }
 
 @celery_app.task(bind=True)
-def transfer_youtube_to_spotify_task(self, user_id: int, playlist_id: str, target_title: str):
-    loop = asyncio.get_event_loop()
-    if loop.is_closed():
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-    return loop.run_until_complete(_transfer_youtube_to_spotify_async(user_id, playlist_id, target_title))
+def finish_transfer_batch_task(self, results: list[dict]):
+    """Chord callback of a batch transfer; its task id is the batch id."""
+    summary = summarize_batch(results)
+    run_async(publish_progress(self.request.id, {"stage": "done", "result": summary}))
+    return summary
@@ -0,0 +1,116 @@
+"""Candidates/second of the match scoring engine against the old per-candidate loops.
+
+Usage (from backend/):
+
+    python -m benchmarks.match_scoring --tracks 5000 --candidates 10
+"""
+import argparse
+import random
+import time
+
+from app.services.matching import best_matches, prepare_track
+from app.services.youtube_parse import normalize_title
+
+WORDS = [
+    "love", "night", "heart", "fire", "dream", "light", "summer", "rain", "dance", "gold",
+    "river", "city", "shadow", "wild", "blue", "home", "stars", "run", "ocean", "echo",
+]
+SUFFIXES = ["(Official Video)", "(Lyrics)", "[HD]", "(Live)", "(Audio)", ""]
+
+
+def synthetic_data(n_tracks: int, n_candidates: int, seed: int = 7):
+    rng = random.Random(seed)
+    tracks, candidate_lists = [], []
+    for _ in range(n_tracks):
+        title = " ".join(rng.sample(WORDS, rng.randint(1, 4))).title()
+        artist = " ".join(rng.sample(WORDS, rng.randint(1, 2))).title()
+        duration = rng.randint(120_000, 360_000)
+        tracks.append({"title": title, "artist": artist, "duration_ms": duration})
+        candidates = []
+        for _ in range(n_candidates):
+            words = title.split() if rng.random() < 0.3 else rng.sample(WORDS, rng.randint(1, 4))
+            candidates.append({
+                "title": f"{artist} - {' '.join(words)} {rng.choice(SUFFIXES)}",
+                "artist": artist if rng.random() < 0.5 else rng.choice(WORDS).title(),
+                "duration_ms": duration + rng.randint(-20_000, 20_000),
+            })
+        candidate_lists.append(candidates)
+    return tracks, candidate_lists
+
+
+def legacy_youtube(title: str, artist: str, candidates: list[dict]):
+    """The scoring loop youtube_search used before the matching engine."""
+    best_index, best_ratio = None, 0.0
+    target_str = f"{title} {artist}".lower()
+    for index, candidate in enumerate(candidates):
+        yt_title = candidate["title"].lower()
+        target_words = set(target_str.split())
+        yt_words = set(yt_title.split())
+        if not target_words:
+            continue
+        overlap = len(target_words.intersection(yt_words)) / len(target_words)
+        if overlap > best_ratio:
+            best_ratio, best_index = overlap, index
+    return best_index if best_ratio > 0.5 else None
+
+
+def legacy_spotify(track: str, candidates: list[dict]):
+    """The scoring loop spotify_search used before the matching engine."""
+    best_index, best_ratio = None, 0.0
+    for index, candidate in enumerate(candidates):
+        normal_title = normalize_title(candidate["title"])
+        normal_track = normalize_title(track)
+        if normal_title == normal_track:
+            return index
+        target_words = set(normal_track.split())
+        title_words = set(normal_title.split())
+        if not target_words:
+            continue
+        ratio = len(target_words.intersection(title_words)) / len(target_words)
+        if ratio > best_ratio:
+            best_ratio, best_index = ratio, index
+    return best_index if best_ratio > 0.5 else None
+
+
+def engine_youtube(tracks, candidate_lists):
+    best_matches([prepare_track(t["title"], t["artist"]) for t in tracks], candidate_lists)
+
+
+def engine_spotify(tracks, candidate_lists):
+    # No source duration, as in spotify_search: the same work as legacy_spotify plus artist credit
+    prepared = [prepare_track(t["title"], t["artist"], include_artist=False) for t in tracks]
+    best_matches(prepared, candidate_lists, exact_title_wins=True)
+
+
+def timed(fn, n_candidates: int, repeat: int) -> float:
+    """Candidates/second of the fastest of ``repeat`` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return n_candidates / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tracks", type=int, default=5000)
+    parser.add_argument("--candidates", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5, help="runs per row; the fastest is reported")
+    args = parser.parse_args()
+
+    tracks, candidate_lists = synthetic_data(args.tracks, args.candidates)
+    total = args.tracks * args.candidates
+    rows = [
+        ("youtube (legacy)", lambda: [legacy_youtube(t["title"], t["artist"], c) for t, c in zip(tracks, candidate_lists)]),
+        ("youtube (engine)", lambda: engine_youtube(tracks, candidate_lists)),
+        ("spotify (legacy)", lambda: [legacy_spotify(t["title"], c) for t, c in zip(tracks, candidate_lists)]),
+        ("spotify (engine)", lambda: engine_spotify(tracks, candidate_lists)),
+    ]
+    print(f"{args.tracks} tracks x {args.candidates} candidates")
+    for name, fn in rows:
+        print(f"{name:<18} {timed(fn, total, args.repeat):>12,.0f} candidates/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""Local stand-ins for the Spotify Web API and YouTube Data API.
+
+One Starlette app serves both: Spotify under ``/v1`` and YouTube under
+``/youtube/v3``. The benchmark configures it through ``POST /_reset``
+(playlist size, latency, 429 rate, page size) and reads per-endpoint call
+counts from ``GET /_stats``. Source playlists are synthetic: track ``i`` is
+"Song i" by "Artist i" on Spotify and "Song i - Artist i (Official Video)" on
+YouTube, so every track has a findable match on the other side.
+"""
+import asyncio
+import random
+import re
+from collections import Counter
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+state = {
+    "tracks": 100,
+    "latency_ms": 20.0,
+    "error_rate": 0.0,
+    "page_size": 100,
+    "calls": Counter(),
+    "inserted": 0,
+}
+
+
+def _duration_ms(i: int) -> int:
+    return 150_000 + (i * 7919) % 150_000
+
+
+async def _simulate(request: Request, endpoint: str, provider: str):
+    """Count the call, wait the configured latency and maybe answer 429."""
+    state["calls"][endpoint] += 1
+    if state["latency_ms"]:
+        await asyncio.sleep(state["latency_ms"] / 1000)
+    if state["error_rate"] and random.random() < state["error_rate"]:
+        state["calls"]["429"] += 1
+        if provider == "youtube":
+            body = {"error": {"code": 429, "message": "Rate limit exceeded", "errors": [{"reason": "rateLimitExceeded"}]}}
+        else:
+            body = {"error": {"status": 429, "message": "API rate limit exceeded"}}
+        return JSONResponse(body, status_code=429, headers={"Retry-After": "1"})
+    return None
+
+
+def _parse_fields(spec: str) -> dict:
+    """Parse a YouTube ``fields`` mask, e.g. ``items(id,snippet/title)``, into a tree.
+
+    Each key maps to its sub-selection, or None to keep the whole value.
+    """
+    tokens = re.findall(r"[^,/()]+|[,/()]", spec.replace(" ", ""))
+    pos = 0
+
+    def merge(into: dict, tree: dict):
+        for key, sub in tree.items():
+            if key not in into:
+                into[key] = sub
+            elif into[key] is not None:
+                # None (the whole value) wins over a narrower selection
+                into[key] = None if sub is None else merge(into[key], sub)
+        return into
+
+    def parse_list() -> dict:
+        nonlocal pos
+        tree = {}
+        while True:
+            merge(tree, parse_path())
+            if pos < len(tokens) and tokens[pos] == ",":
+                pos += 1
+                continue
+            return tree
+
+    def parse_path() -> dict:
+        nonlocal pos
+        name = tokens[pos]
+        pos += 1
+        if pos < len(tokens) and tokens[pos] == "/":
+            pos += 1
+            return {name: parse_path()}
+        if pos < len(tokens) and tokens[pos] == "(":
+            pos += 1
+            sub = parse_list()
+            pos += 1  # ")"
+            return {name: sub}
+        return {name: None}
+
+    return parse_list()
+
+
+def _select(value, tree: dict | None):
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [_select(v, tree) for v in value]
+    if isinstance(value, dict):
+        return {k: _select(value[k], sub) for k, sub in tree.items() if k in value}
+    return value
+
+
+def _youtube_response(request: Request, body: dict) -> JSONResponse:
+    """Apply the request's ``fields`` partial-response mask, as the real API does."""
+    fields = request.query_params.get("fields")
+    return JSONResponse(_select(body, _parse_fields(fields)) if fields else body)
+
+
+# --- Spotify ---
+
+async def spotify_playlist_items(request: Request):
+    if (error := await _simulate(request, "spotify playlists/items", "spotify")):
+        return error
+    offset = int(request.query_params.get("offset", 0))
+    limit = min(int(request.query_params.get("limit", 100)), state["page_size"])
+    total = state["tracks"]
+    items = [
+        {
+            "track": {
+                "id": f"sp{i}",
+                "uri": f"spotify:track:sp{i}",
+                "name": f"Song {i}",
+                "artists": [{"name": f"Artist {i}"}],
+                "album": {"name": f"Album {i % 50}"},
+                "duration_ms": _duration_ms(i),
+                "external_ids": {"isrc": f"QZBENCH{i:05d}"},
+            }
+        }
+        for i in range(offset, min(total, offset + limit))
+    ]
+    next_url = None
+    if offset + limit < total:
+        next_url = str(request.url.include_query_params(offset=offset + limit, limit=limit))
+    return JSONResponse({"items": items, "total": total, "offset": offset, "limit": limit, "next": next_url})
+
+
+async def spotify_playlist(request: Request):
+    if (error := await _simulate(request, "spotify playlists", "spotify")):
+        return error
+    return JSONResponse({"snapshot_id": f"bench-snapshot-{state['tracks']}"})
+
+
+async def spotify_search(request: Request):
+    if (error := await _simulate(request, "spotify search", "spotify")):
+        return error
+    q = request.query_params.get("q", "")
+    words = q.split()
+    # Queries look like "Song 12 Artist 12" or "isrc:QZBENCH00012"
+    if q.startswith("isrc:"):
+        i = int(q[len("isrc:QZBENCH"):] or 0)
+    else:
+        i = int(words[1]) if len(words) > 1 and words[1].isdigit() else 0
+    limit = int(request.query_params.get("limit", 10))
+    items = [
+        {
+            "id": f"sp{i}",
+            "uri": f"spotify:track:sp{i}",
+            "name": f"Song {i}" if n == 0 else f"Song {i} (Remix {n})",
+            "artists": [{"name": f"Artist {i}"}],
+            "duration_ms": _duration_ms(i) + n * 30_000,
+            "external_ids": {"isrc": f"QZBENCH{i:05d}"},
+        }
+        for n in range(min(limit, 3))
+    ]
+    return JSONResponse({"tracks": {"items": items, "total": len(items), "next": None}})
+
+
+async def spotify_me(request: Request):
+    if (error := await _simulate(request, "spotify me", "spotify")):
+        return error
+    return JSONResponse({"id": "bench-user"})
+
+
+async def spotify_my_playlists(request: Request):
+    if request.method == "POST":
+        if (error := await _simulate(request, "spotify me/playlists.create", "spotify")):
+            return error
+        return JSONResponse({"id": "bench-spotify-playlist", "snapshot_id": "s0"}, status_code=201)
+    if (error := await _simulate(request, "spotify me/playlists", "spotify")):
+        return error
+    offset = int(request.query_params.get("offset", 0))
+    limit = int(request.query_params.get("limit", 50))
+    total = 120
+    items = [{"id": f"pl{i}", "name": f"Playlist {i}", "snapshot_id": f"s{i}", "tracks": {"total": 10}} for i in range(offset, min(total, offset + limit))]
+    next_url = str(request.url.include_query_params(offset=offset + limit)) if offset + limit < total else None
+    return JSONResponse({"items": items, "total": total, "offset": offset, "limit": limit, "next": next_url})
+
+
+async def spotify_add_items(request: Request):
+    if (error := await _simulate(request, "spotify playlists/items.add", "spotify")):
+        return error
+    uris = (await request.json())["uris"]
+    if len(uris) > 100:
+        return JSONResponse({"error": {"status": 400, "message": "Too many ids requested"}}, status_code=400)
+    state["inserted"] += len(uris)
+    return JSONResponse({"snapshot_id": f"snap{state['inserted']}"}, status_code=201)
+
+
+# --- YouTube ---
+
+async def youtube_search(request: Request):
+    if (error := await _simulate(request, "youtube search.list", "youtube")):
+        return error
+    q = request.query_params.get("q", "")
+    words = q.split()
+    i = int(words[1]) if len(words) > 1 and words[1].isdigit() else 0
+    max_results = int(request.query_params.get("maxResults", 5))
+    items = [
+        {
+            "id": {"kind": "youtube#video", "videoId": f"yt{i}x{n}"},
+            "snippet": {
+                "title": f"Song {i} - Artist {i} (Official Video)" if n == 0 else f"Song {i} cover #{n}",
+                "channelTitle": f"Artist {i}" if n == 0 else f"Channel {n}",
+                "description": "x" * 200,
+                "thumbnails": {"default": {"url": "https://i.ytimg.com/vi/x/default.jpg", "width": 120, "height": 90}},
+            },
+        }
+        for n in range(max_results)
+    ]
+    return _youtube_response(request, {"kind": "youtube#searchListResponse", "items": items})
+
+
+async def youtube_videos(request: Request):
+    if (error := await _simulate(request, "youtube videos.list", "youtube")):
+        return error
+    ids = request.query_params.get("id", "").split(",")
+    items = []
+    for video_id in filter(None, ids):
+        i = int(video_id[2:].split("x")[0])
+        seconds = _duration_ms(i) // 1000
+        items.append({"id": video_id, "contentDetails": {"duration": f"PT{seconds // 60}M{seconds % 60}S"}})
+    return _youtube_response(request, {"items": items})
+
+
+async def youtube_playlist_items(request: Request):
+    if request.method == "POST":
+        if (error := await _simulate(request, "youtube playlistItems.insert", "youtube")):
+            return error
+        state["inserted"] += 1
+        body = await request.json()
+        return _youtube_response(request, {"id": f"item{state['inserted']}", "kind": "youtube#playlistItem", **body})
+    if (error := await _simulate(request, "youtube playlistItems.list", "youtube")):
+        return error
+    start = int(request.query_params.get("pageToken") or 0)
+    size = min(int(request.query_params.get("maxResults", 50)), state["page_size"], 50)
+    total = state["tracks"]
+    items = [
+        {
+            "id": f"pi{i}",
+            "snippet": {
+                "title": f"Song {i} - Artist {i} (Official Video)",
+                "description": "x" * 500,
+                "resourceId": {"kind": "youtube#video", "videoId": f"yt{i}x0"},
+                "thumbnails": {
+                    size_name: {"url": f"https://i.ytimg.com/vi/yt{i}/{size_name}.jpg", "width": 480, "height": 360}
+                    for size_name in ("default", "medium", "high", "standard", "maxres")
+                },
+            },
+            "contentDetails": {"videoId": f"yt{i}x0"},
+        }
+        for i in range(start, min(total, start + size))
+    ]
+    body = {"items": items, "pageInfo": {"totalResults": total, "resultsPerPage": size}}
+    if start + size < total:
+        body["nextPageToken"] = str(start + size)
+    return _youtube_response(request, body)
+
+
+async def youtube_playlists(request: Request):
+    if request.method == "POST":
+        if (error := await _simulate(request, "youtube playlists.insert", "youtube")):
+            return error
+        body = await request.json()
+        return _youtube_response(request, {"id": "bench-youtube-playlist", "kind": "youtube#playlist", **body})
+    if (error := await _simulate(request, "youtube playlists.list", "youtube")):
+        return error
+    items = [
+        {"id": f"ypl{i}", "snippet": {"title": f"Playlist {i}", "description": "x" * 300}, "contentDetails": {"itemCount": 10}}
+        for i in range(25)
+    ]
+    return _youtube_response(request, {"items": items, "etag": "bench-etag"})
+
+
+# --- Control ---
+
+async def reset(request: Request):
+    config = await request.json()
+    for key in ("tracks", "latency_ms", "error_rate", "page_size"):
+        if key in config:
+            state[key] = config[key]
+    state["calls"] = Counter()
+    state["inserted"] = 0
+    return JSONResponse({"ok": True})
+
+
+async def stats(request: Request):
+    return JSONResponse({"calls": dict(state["calls"]), "inserted": state["inserted"]})
+
+
+app = Starlette(routes=[
+    Route("/v1/playlists/{playlist_id}/items", spotify_playlist_items, methods=["GET"]),
+    Route("/v1/playlists/{playlist_id}/items", spotify_add_items, methods=["POST"]),
+    Route("/v1/playlists/{playlist_id}", spotify_playlist),
+    Route("/v1/search", spotify_search),
+    Route("/v1/me", spotify_me),
+    Route("/v1/me/playlists", spotify_my_playlists, methods=["GET", "POST"]),
+    Route("/youtube/v3/search", youtube_search),
+    Route("/youtube/v3/videos", youtube_videos),
+    Route("/youtube/v3/playlistItems", youtube_playlist_items, methods=["GET", "POST"]),
+    Route("/youtube/v3/playlists", youtube_playlists, methods=["GET", "POST"]),
+    Route("/_reset", reset, methods=["POST"]),
+    Route("/_stats", stats),
+])
+
+
+def serve(port: int):
+    import uvicorn
+
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
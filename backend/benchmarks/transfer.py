@@ -0,0 +1,187 @@
+"""End-to-end transfer benchmark against local Spotify/YouTube stand-ins.
+
+Runs both transfer directions at each playlist size, with no live accounts
+and no real quota. For each run it records wall time, time to the first
+inserted track, API calls by endpoint and peak Python memory (tracemalloc).
+
+Usage (from backend/):
+
+    python -m benchmarks.transfer --sizes 100 1000 10000 --latency-ms 20 --error-rate 0.01
+
+The app runs against a throwaway SQLite database, with Redis disabled unless
+--redis-url is given. The match cache is emptied before every run, so each
+run pays for every search.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import sys
+import tempfile
+import time
+import tracemalloc
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def configure_environment(stub_url: str, db_path: str, redis_url: str | None):
+    """Point the app at the stand-ins before any app module reads settings."""
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{db_path}"
+    os.environ["SPOTIFY_API_BASE_URL"] = f"{stub_url}/v1"
+    os.environ["YOUTUBE_API_BASE_URL"] = f"{stub_url}/youtube/v3"
+    os.environ["CELERY_RESULT_BACKEND"] = "rpc://"
+    os.environ["REDIS_URL"] = redis_url or ""
+    os.environ["YOUTUBE_DAILY_QUOTA"] = str(10**12)
+    for name in (
+        "JWT_SECRET", "SECRET_KEY", "GOOGLE_CLIENT_ID", "GOOGLE_CLIENT_SECRET",
+        "SPOTIFY_CLIENT_ID", "SPOTIFY_CLIENT_SECRET", "YOUTUBE_CLIENT_ID", "YOUTUBE_CLIENT_SECRET",
+    ):
+        os.environ.setdefault(name, "benchmark")
+
+
+async def wait_for_stub(client, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            await client.get("/_stats")
+            return
+        except Exception:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def prepare_database():
+    from sqlalchemy import delete
+
+    from app.core.database import AsyncSessionLocal, engine
+    from app.models.oauth_account import OAuthAccount
+    from app.models.track_match import TrackMatch
+    from app.models.transfer import TransferItem, TransferJob
+    from app.models.user import Base, User
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSessionLocal() as db:
+        for model in (TransferItem, TransferJob, TrackMatch, OAuthAccount, User):
+            await db.execute(delete(model))
+        db.add(User(id=1, email="bench@example.com", name="Bench", google_id="bench"))
+        for provider in ("spotify", "youtube"):
+            db.add(OAuthAccount(
+                user_id=1,
+                provider=provider,
+                access_token="bench-token",
+                refresh_token="bench-refresh",
+                expires_at=int(time.time()) + 24 * 3600,
+            ))
+        await db.commit()
+
+
+async def run_one(stub, direction: str, size: int, args) -> dict:
+    from app.tasks.transfer_tasks import (
+        _transfer_spotify_to_youtube_async,
+        _transfer_youtube_to_spotify_async,
+    )
+
+    transfer = _transfer_spotify_to_youtube_async if direction == "spotify-to-youtube" else _transfer_youtube_to_spotify_async
+    await prepare_database()
+    await stub.post("/_reset", json={
+        "tracks": size,
+        "latency_ms": args.latency_ms,
+        "error_rate": args.error_rate,
+        "page_size": args.page_size,
+    })
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = await transfer(1, "bench-playlist", "Benchmark", f"bench-{direction}-{size}")
+    wall = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = (await stub.get("/_stats")).json()
+    calls = stats["calls"]
+    return {
+        "direction": direction,
+        "tracks": size,
+        "wall_seconds": round(wall, 2),
+        "tracks_per_second": round(size / wall, 1) if wall else None,
+        "api_calls": sum(n for endpoint, n in calls.items() if endpoint != "429"),
+        "throttled": calls.get("429", 0),
+        "calls_by_endpoint": {k: v for k, v in sorted(calls.items()) if k != "429"},
+        "matched": result.get("matched"),
+        "first_insert_seconds": result.get("first_insert_seconds"),
+        "inserted": stats["inserted"],
+        "peak_memory_mb": round(peak / 2**20, 1),
+    }
+
+
+async def run(args, stub_url: str):
+    import httpx
+
+    from app.core.http_client import close_http_clients
+
+    results = []
+    async with httpx.AsyncClient(base_url=stub_url, timeout=30) as stub:
+        await wait_for_stub(stub)
+        for size in args.sizes:
+            for direction in args.directions:
+                row = await run_one(stub, direction, size, args)
+                results.append(row)
+                print(
+                    f"{row['direction']:<19} {row['tracks']:>6} tracks  {row['wall_seconds']:>8.2f}s  "
+                    f"{row['tracks_per_second']:>8.1f} tracks/s  {row['api_calls']:>6} calls  "
+                    f"{row['throttled']:>4} x429  matched {row['matched']:>6}  first insert {row['first_insert_seconds'] or 0:>6.2f}s  "
+                    f"peak {row['peak_memory_mb']:>6.1f} MB",
+                    flush=True,
+                )
+    await close_http_clients()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument(
+        "--directions", nargs="+",
+        choices=["spotify-to-youtube", "youtube-to-spotify"],
+        default=["spotify-to-youtube", "youtube-to-spotify"],
+    )
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="added to every stub API response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of stub calls answered with 429")
+    parser.add_argument("--page-size", type=int, default=100, help="largest page the stubs return")
+    parser.add_argument("--redis-url", default=None, help="use this Redis for caches and quota")
+    parser.add_argument("--json", dest="json_path", help="also write the results to this file")
+    args = parser.parse_args()
+
+    port = _free_port()
+    stub_url = f"http://127.0.0.1:{port}"
+    db_path = os.path.join(tempfile.mkdtemp(prefix="playlistbridge-bench-"), "bench.db")
+    configure_environment(stub_url, db_path, args.redis_url)
+
+    from benchmarks.stub_servers import serve
+
+    # The stand-ins run in their own process so their allocations and CPU time
+    # do not show up in the measurements.
+    server = multiprocessing.Process(target=serve, args=(port,), daemon=True)
+    server.start()
+    try:
+        results = asyncio.run(run(args, stub_url))
+    finally:
+        server.terminate()
+        server.join()
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
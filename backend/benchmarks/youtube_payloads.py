@@ -0,0 +1,136 @@
+"""Payload size and JSON decode time of YouTube list/search calls, full vs. partial responses.
+
+Fetches the same pages from the local YouTube stand-in twice: once with the
+full ``part`` payload and once with the ``fields=`` masks the app sends.
+
+Usage (from backend/):
+
+    python -m benchmarks.youtube_payloads --tracks 5000 --searches 200
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.transfer import _free_port, configure_environment, wait_for_stub
+
+
+async def fetch_bodies(client, path: str, params: dict, pages: bool = True) -> list[bytes]:
+    """Raw response bodies, following ``nextPageToken`` when ``pages`` is set."""
+    bodies = []
+    page_token = None
+    while True:
+        r = await client.get(path, params={**params, **({"pageToken": page_token} if page_token else {})})
+        r.raise_for_status()
+        bodies.append(r.content)
+        page_token = r.json().get("nextPageToken") if pages else None
+        if not page_token:
+            return bodies
+
+
+def decode_seconds(bodies: list[bytes], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for body in bodies:
+            json.loads(body)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+async def run(args, stub_url: str) -> list[dict]:
+    import httpx
+
+    from app.api.youtube.playlists import PLAYLIST_FIELDS
+    from app.services.youtube_playlists import ITEM_FIELDS
+    from app.tasks.transfer_tasks import SEARCH_FIELDS
+
+    calls = {
+        "playlistItems.list": (
+            "/youtube/v3/playlistItems",
+            {"part": "snippet", "playlistId": "bench", "maxResults": 50},
+            ITEM_FIELDS,
+            True,
+        ),
+        "playlists.list": (
+            "/youtube/v3/playlists",
+            {"part": "snippet,contentDetails", "mine": "true", "maxResults": 50},
+            PLAYLIST_FIELDS,
+            True,
+        ),
+    }
+
+    results = []
+    async with httpx.AsyncClient(base_url=stub_url, timeout=30) as client:
+        await wait_for_stub(client)
+        await client.post("/_reset", json={"tracks": args.tracks, "latency_ms": 0, "page_size": 50})
+
+        for name, (path, params, fields, pages) in calls.items():
+            full = await fetch_bodies(client, path, params, pages)
+            partial = await fetch_bodies(client, path, {**params, "fields": fields}, pages)
+            results.append(compare(name, full, partial, args.repeat))
+
+        full, partial = [], []
+        for i in range(args.searches):
+            params = {"part": "snippet", "q": f"Song {i} Artist {i}", "type": "video", "maxResults": 5}
+            full += await fetch_bodies(client, "/youtube/v3/search", params, pages=False)
+            partial += await fetch_bodies(client, "/youtube/v3/search", {**params, "fields": SEARCH_FIELDS}, pages=False)
+        results.append(compare("search.list", full, partial, args.repeat))
+    return results
+
+
+def compare(name: str, full: list[bytes], partial: list[bytes], repeat: int) -> dict:
+    full_bytes, partial_bytes = sum(map(len, full)), sum(map(len, partial))
+    full_decode, partial_decode = decode_seconds(full, repeat), decode_seconds(partial, repeat)
+    row = {
+        "call": name,
+        "responses": len(full),
+        "full_bytes": full_bytes,
+        "partial_bytes": partial_bytes,
+        "bytes_saved": round(1 - partial_bytes / full_bytes, 3),
+        "full_decode_ms": round(full_decode * 1000, 2),
+        "partial_decode_ms": round(partial_decode * 1000, 2),
+    }
+    print(
+        f"{name:<19} {row['responses']:>5} responses  {full_bytes / 1024:>9.1f} KiB -> {partial_bytes / 1024:>8.1f} KiB "
+        f"({row['bytes_saved']:.0%} smaller)  decode {row['full_decode_ms']:>8.2f} ms -> {row['partial_decode_ms']:>7.2f} ms",
+        flush=True,
+    )
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tracks", type=int, default=5000, help="size of the playlist whose items are listed")
+    parser.add_argument("--searches", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5, help="decode passes; the fastest is reported")
+    parser.add_argument("--json", dest="json_path", help="also write the results to this file")
+    args = parser.parse_args()
+
+    port = _free_port()
+    stub_url = f"http://127.0.0.1:{port}"
+    db_path = os.path.join(tempfile.mkdtemp(prefix="playlistbridge-bench-"), "bench.db")
+    configure_environment(stub_url, db_path, None)
+
+    from benchmarks.stub_servers import serve
+
+    server = multiprocessing.Process(target=serve, args=(port,), daemon=True)
+    server.start()
+    try:
+        results = asyncio.run(run(args, stub_url))
+    finally:
+        server.terminate()
+        server.join()
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -82,6 +82,40 @@ export default function Dashboard() {
     }
   };
 
+  const watchTransfer = (taskId: string) => {
+    const source = new EventSource(
+      `${BACKEND_URL}/api/transfer/progress/${taskId}`,
+      { withCredentials: true }
+    );
+    source.onmessage = (event) => {
+      const progress = JSON.parse(event.data);
+      if (progress.stage === "done") {
+        source.close();
+        setMessageType("success");
+        setMessage(
+          `Transfer complete: ${progress.result?.matched}/${progress.result?.total} tracks matched`
+        );
+      } else if (progress.stage === "failed") {
+        source.close();
+        setMessageType("info");
+        setMessage("Transfer failed.");
+      } else if (progress.stage === "deferred") {
+        setMessage("YouTube quota used up for today; the transfer will resume automatically.");
+      } else if (progress.stage === "retrying") {
+        setMessage("Connection problem; retrying the transfer...");
+      } else if (progress.total) {
+        setMessage(
+          `Transferring... ${progress.processed}/${progress.total} tracks processed, ${progress.matched} matched`
+        );
+      }
+    };
+    source.onerror = () => {
+      // Live progress unavailable: fall back to polling the status endpoint
+      source.close();
+      pollTransferStatus(taskId);
+    };
+  };
+
   const transfer = async (playlistId: string) => {
     setMessage("Transferring playlist (this happens in the background)...");
     setMessageType("info");
@@ -96,7 +130,7 @@ export default function Dashboard() {
     );
     const data = await res.json();
     if (data.task_id) {
-        pollTransferStatus(data.task_id);
+        watchTransfer(data.task_id);
     } else {
         setMessage("Failed to start transfer.");
     }
@@ -116,7 +150,7 @@ export default function Dashboard() {
     );
     const data = await res.json();
     if (data.task_id) {
-        pollTransferStatus(data.task_id);
+        watchTransfer(data.task_id);
     } else {
         setMessage("Failed to start transfer.");
     }